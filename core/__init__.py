@@ -10,7 +10,7 @@ from .config import GAConfig
 from .result import GAResult
 from .individual import Individual, create_random_individual, create_greedy_individual
 from .population import Population, initialize_population
-from .selection import select_tournament, select_rank_based, select_parents, select_survivors
+from .selection import select_tournament, select_rank_based, select_parents, select_parents_view, select_survivors
 from .crossover import crossover_ox, crossover_pmx, create_offspring_crossover
 from .mutation import mutate_swap, mutate_inversion, mutate_scramble, create_offspring_mutation, adaptive_mutate
 from .replacement import create_new_generation, steady_state_replacement, elitist_replacement, tournament_replacement
@@ -42,6 +42,7 @@ __all__ = [
     'select_tournament',
     'select_rank_based',
     'select_parents',
+    'select_parents_view',
     'select_survivors',
     
     # Crossover operators
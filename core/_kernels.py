@@ -0,0 +1,275 @@
+"""
+Compiled numeric kernels for the genetic algorithm hot paths.
+
+Kernels are compiled with Numba when it is installed; otherwise they run
+as plain Python functions over NumPy arrays. Numba is optional but the
+fallback is slow: the batch kernels then loop element by element in the
+interpreter. With Numba, every kernel is compiled by _warmup() when this
+module is imported (cached on disk after the first run).
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Fallback decorator used when Numba is not installed."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def tour_distance(tour, dist):
+    """Total distance of a closed tour over a distance matrix."""
+    n = tour.shape[0]
+    total = 0.0
+    if n == 0:
+        return total
+    for i in range(n - 1):
+        total += dist[tour[i], tour[i + 1]]
+    total += dist[tour[n - 1], tour[0]]
+    return total
+
+
+@njit(parallel=True, cache=True)
+def batch_tour_distance(tours, dist, out):
+    """Total distance of every tour (one per row of tours) written into out."""
+    for r in prange(tours.shape[0]):
+        out[r] = tour_distance(tours[r], dist)
+
+
+@njit(cache=True)
+def nearest_neighbor_tour(dist, start_city, tour):
+    """Fill tour with the greedy nearest-neighbour route from start_city."""
+    n = tour.shape[0]
+    visited = np.zeros(n, dtype=np.bool_)
+    tour[0] = start_city
+    visited[start_city] = True
+    current = start_city
+    for step in range(1, n):
+        # Ties go to the lowest city index
+        best_city = -1
+        best_dist = np.inf
+        for city in range(n):
+            if not visited[city] and dist[current, city] < best_dist:
+                best_dist = dist[current, city]
+                best_city = city
+        tour[step] = best_city
+        visited[best_city] = True
+        current = best_city
+
+
+@njit(cache=True)
+def fill_pmx_positions(child, parent, mapping, in_child):
+    """
+    Fill empty (-1) positions of a PMX child in place.
+
+    Args:
+        child: Child tour (int32), -1 marks empty positions
+        parent: Parent tour providing the remaining cities
+        mapping: City mapping from the exchanged segment (-1 means unmapped)
+        in_child: Boolean mask of cities already placed in child
+    """
+    n = child.shape[0]
+    # Cursor over parent order for the fallback; placed cities never become
+    # free again, so it only moves forward (O(n) total instead of per call)
+    free_pos = 0
+    for i in range(n):
+        if child[i] != -1:
+            continue
+        city = parent[i]
+        # Follow the mapping chain until a free city (bounded to avoid cycles)
+        steps = 0
+        while in_child[city] and mapping[city] != -1 and steps < n:
+            city = mapping[city]
+            steps += 1
+        # Still taken: use the next city of the parent not yet in child
+        if in_child[city]:
+            while in_child[parent[free_pos]]:
+                free_pos += 1
+            city = parent[free_pos]
+        child[i] = city
+        in_child[city] = True
+
+
+@njit(cache=True)
+def ox_child(segment_parent, fill_parent, cut1, cut2, child):
+    """
+    Build one OX child in place.
+
+    Copies segment_parent[cut1:cut2+1] and fills the remaining positions,
+    starting after cut2 and wrapping around, with the unused cities of
+    fill_parent in the order they appear.
+    """
+    n = child.shape[0]
+    used = np.zeros(n, dtype=np.bool_)
+    for i in range(cut1, cut2 + 1):
+        child[i] = segment_parent[i]
+        used[segment_parent[i]] = True
+    pos = (cut2 + 1) % n
+    for j in range(n):
+        city = fill_parent[j]
+        if not used[city]:
+            child[pos] = city
+            pos = (pos + 1) % n
+
+
+@njit(cache=True)
+def pmx_child(segment_parent, fill_parent, cut1, cut2, child):
+    """
+    Build one PMX child in place.
+
+    Copies segment_parent[cut1:cut2+1] and fills the remaining positions from
+    fill_parent, resolving conflicts through the segment mapping.
+    """
+    n = child.shape[0]
+    mapping = np.full(n, -1, dtype=np.int32)
+    in_child = np.zeros(n, dtype=np.bool_)
+    child[:] = -1
+    for i in range(cut1, cut2 + 1):
+        child[i] = segment_parent[i]
+        in_child[segment_parent[i]] = True
+        if fill_parent[i] != segment_parent[i]:
+            mapping[fill_parent[i]] = segment_parent[i]
+    fill_pmx_positions(child, fill_parent, mapping, in_child)
+
+
+@njit(cache=True)
+def swap_positions(tour, i, j):
+    """Swap the cities at positions i and j in place."""
+    tmp = tour[i]
+    tour[i] = tour[j]
+    tour[j] = tmp
+
+
+@njit(cache=True)
+def reverse_segment(tour, cut1, cut2):
+    """Reverse tour[cut1:cut2+1] in place."""
+    while cut1 < cut2:
+        tmp = tour[cut1]
+        tour[cut1] = tour[cut2]
+        tour[cut2] = tmp
+        cut1 += 1
+        cut2 -= 1
+
+
+@njit(parallel=True, cache=True)
+def batch_reverse_segments(tours, cuts):
+    """Reverse tours[r, cuts[r, 0]:cuts[r, 1]+1] in place for every row r."""
+    for r in prange(tours.shape[0]):
+        reverse_segment(tours[r], cuts[r, 0], cuts[r, 1])
+
+
+@njit(parallel=True, cache=True)
+def batch_invert_with_delta(tours, cuts, dist, distances):
+    """
+    Reverse tours[r, cuts[r, 0]:cuts[r, 1]+1] in place for every row r and
+    update distances[r] with the 2-opt delta (symmetric dist only).
+    
+    Rows with cuts[r, 0] == cuts[r, 1] are left untouched.
+    """
+    n = tours.shape[1]
+    for r in prange(tours.shape[0]):
+        cut1 = cuts[r, 0]
+        cut2 = cuts[r, 1]
+        if cut1 >= cut2:
+            continue
+        tour = tours[r]
+        if cut2 - cut1 + 1 < n:
+            # Only the two edges around the segment change
+            a = tour[cut1 - 1]
+            b = tour[cut1]
+            c = tour[cut2]
+            d = tour[(cut2 + 1) % n]
+            distances[r] += (float(dist[a, c]) + float(dist[b, d])
+                             - float(dist[a, b]) - float(dist[c, d]))
+        reverse_segment(tour, cut1, cut2)
+
+
+@njit(cache=True)
+def _splitmix64(x):
+    """SplitMix64 hash of a uint64 counter (counter-based, thread-safe RNG)."""
+    z = x + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+@njit(parallel=True, cache=True)
+def tournament_winners(dists, k, seed, out):
+    """
+    Run one k-way tournament per entry of out and store the winner indices.
+    
+    Contestants are drawn with replacement from a counter-based generator
+    keyed by (seed, tournament, draw), so results don't depend on threading.
+    The winner is the contestant with the smallest distance (first on ties).
+    """
+    n = np.uint64(dists.shape[0])
+    base = np.uint64(seed)
+    kk = np.uint64(k)
+    for p in prange(out.shape[0]):
+        counter = base + np.uint64(p) * kk
+        best = -1
+        best_dist = np.inf
+        for j in range(k):
+            idx = np.int64(_splitmix64(counter + np.uint64(j)) % n)
+            if best == -1 or dists[idx] < best_dist:
+                best = idx
+                best_dist = dists[idx]
+        out[p] = best
+
+
+@njit(parallel=True, cache=True)
+def batch_ox(parents, pair_idx, cuts, children):
+    """
+    OX crossover for a batch of parent pairs.
+
+    Args:
+        parents: Parent tours matrix (num_parents, n)
+        pair_idx: Parent row indices for each pair (num_pairs, 2)
+        cuts: Sorted cut points for each pair (num_pairs, 2)
+        children: Output buffer (2 * num_pairs, n)
+    """
+    for p in prange(pair_idx.shape[0]):
+        a = pair_idx[p, 0]
+        b = pair_idx[p, 1]
+        ox_child(parents[a], parents[b], cuts[p, 0], cuts[p, 1], children[2 * p])
+        ox_child(parents[b], parents[a], cuts[p, 0], cuts[p, 1], children[2 * p + 1])
+
+
+@njit(parallel=True, cache=True)
+def batch_pmx(parents, pair_idx, cuts, children):
+    """PMX crossover for a batch of parent pairs (same layout as batch_ox)."""
+    for p in prange(pair_idx.shape[0]):
+        a = pair_idx[p, 0]
+        b = pair_idx[p, 1]
+        pmx_child(parents[b], parents[a], cuts[p, 0], cuts[p, 1], children[2 * p])
+        pmx_child(parents[a], parents[b], cuts[p, 0], cuts[p, 1], children[2 * p + 1])
+
+
+def _warmup():
+    """Compile kernels once at import so the first generation doesn't pay for it."""
+    parents = np.array([[0, 1, 2, 3], [3, 2, 1, 0]], dtype=np.int32)
+    pair_idx = np.array([[0, 1]], dtype=np.int64)
+    cuts = np.array([[1, 2]], dtype=np.int64)
+    children = np.empty((2, 4), dtype=np.int32)
+    batch_ox(parents, pair_idx, cuts, children)
+    batch_pmx(parents, pair_idx, cuts, children)
+    batch_reverse_segments(children, np.repeat(cuts, 2, axis=0))
+    swap_positions(children[0], 0, 1)
+    reverse_segment(children[0], 0, 3)
+    dist = np.zeros((4, 4), dtype=np.int16)
+    batch_invert_with_delta(children, np.repeat(cuts, 2, axis=0), dist, np.zeros(2))
+    nearest_neighbor_tour(dist, 0, children[0])
+    tournament_winners(np.zeros(4), 3, 1, np.empty(2, dtype=np.int64))
+    tour_distance(parents[0], dist)
+    batch_tour_distance(parents, dist, np.empty(2))
+
+
+if NUMBA_AVAILABLE:
+    _warmup()
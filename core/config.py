@@ -11,13 +11,15 @@ class GAConfig:
                  pct_crossover: float, pct_mutation: float,
                  selection: str = "tournament", crossover: str = "OX",
                  mutation: str = "inversion", elitism: int = 1,
-                 seed: Optional[int] = None):
+                 seed: Optional[int] = None, max_workers: Optional[int] = None):
         """
         Initialize GA configuration.
         
         Args:
             N: Population size
-            maxIter: Maximum number of iterations
+            maxIter: Maximum number of iterations (runs stop earlier once the best
+                     distance has converged after a partial restart, or after
+                     maxIter // 4 generations without improvement)
             pct_survivors: Percentage of population selected as survivors
             pct_crossover: Percentage of population created by crossover
             pct_mutation: Percentage of population created by mutation
@@ -26,6 +28,7 @@ class GAConfig:
             mutation: Mutation method ("swap" or "inversion")
             elitism: Number of elite individuals to preserve
             seed: Random seed for reproducibility
+            max_workers: Worker processes for parallel fitness evaluation (None = sequential)
         """
         self.N = N
         self.maxIter = maxIter
@@ -37,6 +40,7 @@ class GAConfig:
         self.mutation = mutation
         self.elitism = elitism
         self.seed = seed
+        self.max_workers = max_workers
         
         # Validate percentages sum approximately to 1.0
         total_pct = pct_survivors + pct_crossover + pct_mutation
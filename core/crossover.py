@@ -1,12 +1,14 @@
 """
 Crossover operators for genetic algorithm (TSP).
 """
-import random
-from typing import Tuple, List
+from typing import Optional, Tuple, List
+import numpy as np
 from .individual import Individual
+from ._kernels import ox_child, pmx_child, batch_ox, batch_pmx
 
 
-def crossover_ox(parent1: Individual, parent2: Individual) -> Tuple[Individual, Individual]:
+def crossover_ox(parent1: Individual, parent2: Individual,
+                 cuts: Optional[Tuple[int, int]] = None) -> Tuple[Individual, Individual]:
     """
     Order Crossover (OX) for TSP.
     
@@ -19,65 +21,34 @@ def crossover_ox(parent1: Individual, parent2: Individual) -> Tuple[Individual,
     Args:
         parent1: First parent
         parent2: Second parent
+        cuts: Optional pre-drawn (cut1, cut2) with cut1 <= cut2
         
     Returns:
         Tuple of two children
     """
-    n = len(parent1.tour)
+    n = parent1.tour.size
+    cut1, cut2 = cuts if cuts is not None else _random_cuts(n)
     
-    # Select two random cut points
-    cut1 = random.randint(0, n - 1)
-    cut2 = random.randint(0, n - 1)
+    # Same kernel as the batched path, so single and batch OX can't disagree
+    child1_tour = np.empty(n, dtype=np.int32)
+    child2_tour = np.empty(n, dtype=np.int32)
+    ox_child(parent1.tour, parent2.tour, cut1, cut2, child1_tour)
+    ox_child(parent2.tour, parent1.tour, cut1, cut2, child2_tour)
     
-    # Ensure cut1 <= cut2
-    if cut1 > cut2:
-        cut1, cut2 = cut2, cut1
-    
-    # Create child1
-    child1_tour = [-1] * n
-    child2_tour = [-1] * n
-    
-    # Copy segment from parent1 to child1
-    child1_tour[cut1:cut2+1] = parent1.tour[cut1:cut2+1]
-    
-    # Copy segment from parent2 to child2
-    child2_tour[cut1:cut2+1] = parent2.tour[cut1:cut2+1]
-    
-    # Fill remaining positions for child1
-    _fill_remaining_ox(child1_tour, parent2.tour, cut1, cut2)
-    
-    # Fill remaining positions for child2
-    _fill_remaining_ox(child2_tour, parent1.tour, cut1, cut2)
-    
-    child1 = Individual(tour=child1_tour)
-    child2 = Individual(tour=child2_tour)
+    child1 = Individual(tour=child1_tour, copy_tour=False)
+    child2 = Individual(tour=child2_tour, copy_tour=False)
     
     return child1, child2
 
 
-def _fill_remaining_ox(child_tour: List[int], parent_tour: List[int], cut1: int, cut2: int):
-    """Helper function to fill remaining positions in OX crossover."""
-    n = len(child_tour)
-    used_cities = set(child_tour[cut1:cut2+1])
-    
-    # Get unused cities from parent in order
-    unused_cities = []
-    for city in parent_tour:
-        if city not in used_cities:
-            unused_cities.append(city)
-    
-    # Fill positions after cut2
-    pos = (cut2 + 1) % n
-    city_idx = 0
-    
-    while city_idx < len(unused_cities):
-        if child_tour[pos] == -1:  # Empty position
-            child_tour[pos] = unused_cities[city_idx]
-            city_idx += 1
-        pos = (pos + 1) % n
+def _random_cuts(n: int) -> Tuple[int, int]:
+    """Draw two sorted random cut points in [0, n)."""
+    cut1, cut2 = np.sort(np.random.randint(0, n, 2))
+    return int(cut1), int(cut2)
 
 
-def crossover_pmx(parent1: Individual, parent2: Individual) -> Tuple[Individual, Individual]:
+def crossover_pmx(parent1: Individual, parent2: Individual,
+                  cuts: Optional[Tuple[int, int]] = None) -> Tuple[Individual, Individual]:
     """
     Partially Mapped Crossover (PMX) for TSP.
     
@@ -90,70 +61,27 @@ def crossover_pmx(parent1: Individual, parent2: Individual) -> Tuple[Individual,
     Args:
         parent1: First parent
         parent2: Second parent
+        cuts: Optional pre-drawn (cut1, cut2) with cut1 <= cut2
         
     Returns:
         Tuple of two children
     """
-    n = len(parent1.tour)
-    
-    # Select two random cut points
-    cut1 = random.randint(0, n - 1)
-    cut2 = random.randint(0, n - 1)
-    
-    # Ensure cut1 <= cut2
-    if cut1 > cut2:
-        cut1, cut2 = cut2, cut1
-    
-    # Initialize children with -1 (empty)
-    child1_tour = [-1] * n
-    child2_tour = [-1] * n
-    
-    # Copy segments from opposite parents
-    child1_tour[cut1:cut2+1] = parent2.tour[cut1:cut2+1]
-    child2_tour[cut1:cut2+1] = parent1.tour[cut1:cut2+1]
+    n = parent1.tour.size
+    cut1, cut2 = cuts if cuts is not None else _random_cuts(n)
     
-    # Create mapping for PMX
-    mapping1 = {}
-    mapping2 = {}
+    # Each child keeps the segment of one parent and is filled from the other
+    child1_tour = np.empty(n, dtype=np.int32)
+    child2_tour = np.empty(n, dtype=np.int32)
+    pmx_child(parent2.tour, parent1.tour, cut1, cut2, child1_tour)
+    pmx_child(parent1.tour, parent2.tour, cut1, cut2, child2_tour)
     
-    for i in range(cut1, cut2 + 1):
-        if parent1.tour[i] != parent2.tour[i]:  # Only map if different
-            mapping1[parent1.tour[i]] = parent2.tour[i]
-            mapping2[parent2.tour[i]] = parent1.tour[i]
-    
-    # Fill remaining positions for child1
-    _fill_pmx_positions(child1_tour, parent1.tour, mapping1, cut1, cut2)
-    
-    # Fill remaining positions for child2
-    _fill_pmx_positions(child2_tour, parent2.tour, mapping2, cut1, cut2)
-    
-    child1 = Individual(tour=child1_tour)
-    child2 = Individual(tour=child2_tour)
+    child1 = Individual(tour=child1_tour, copy_tour=False)
+    child2 = Individual(tour=child2_tour, copy_tour=False)
     
     return child1, child2
 
 
-def _fill_pmx_positions(child_tour, parent_tour, mapping, cut1, cut2):
-    n = len(child_tour)
-    taken = set(x for x in child_tour if x != -1)
-    for i in range(n):
-        if child_tour[i] != -1:
-            continue
-        city = parent_tour[i]
-        # Seguir la cadena de mapeo hasta un valor libre
-        visited = set()
-        while city in taken and city in mapping and city not in visited:
-            visited.add(city)
-            city = mapping[city]
-        # Si sigue ocupado y no hay mapeo, buscar siguiente ciudad del padre que no esté tomada
-        if city in taken:
-            for cand in parent_tour:
-                if cand not in taken:
-                    city = cand
-                    break
-        child_tour[i] = city
-        taken.add(city)
-
+_BATCH_KERNELS = {"OX": batch_ox, "PMX": batch_pmx}
 
 
 def create_offspring_crossover(parents: List[Individual], num_offspring: int, 
@@ -169,19 +97,30 @@ def create_offspring_crossover(parents: List[Individual], num_offspring: int,
     Returns:
         List of offspring
     """
-    offspring = []
+    if num_offspring <= 0:
+        return []
     
-    while len(offspring) < num_offspring:
-        # Select two random parents
-        parent1, parent2 = random.sample(parents, 2)
-        
-        if method == "OX":
-            child1, child2 = crossover_ox(parent1, parent2)
-        elif method == "PMX":
-            child1, child2 = crossover_pmx(parent1, parent2)
-        else:
-            raise ValueError(f"Unknown crossover method: {method}")
-        
-        offspring.extend([child1, child2])
+    batch_kernel = _BATCH_KERNELS.get(method)
+    if batch_kernel is None:
+        raise ValueError(f"Unknown crossover method: {method}")
+    
+    # Stacking copies the tours, so the kernels can never write to the parents
+    parent_tours = np.stack([parent.tour for parent in parents])
+    num_parents, n = parent_tours.shape
+    
+    # Draw all parent index pairs at once, avoiding pairs of the same parent
+    num_pairs = (num_offspring + 1) // 2
+    pair_idx = np.random.randint(0, num_parents, size=(num_pairs, 2))
+    same = pair_idx[:, 0] == pair_idx[:, 1]
+    pair_idx[same, 1] = (pair_idx[same, 1] + 1) % num_parents
+    
+    # Sorted cut points for every pair
+    cuts = np.sort(np.random.randint(0, n, size=(num_pairs, 2)), axis=1)
+    
+    # Run the whole batch in a single kernel call
+    children = np.empty((2 * num_pairs, n), dtype=np.int32)
+    batch_kernel(parent_tours, pair_idx, cuts, children)
     
-    return offspring[:num_offspring]  # Return exactly num_offspring children
\ No newline at end of file
+    # Return exactly num_offspring children
+    # Children own their rows of the fresh buffer, so no per-child copy is needed
+    return [Individual(tour=tour, copy_tour=False) for tour in children[:num_offspring]]
@@ -1,8 +1,9 @@
 """
 Diversity control and adaptive mechanisms for genetic algorithm.
 """
-import random
-from typing import List, Set, Tuple
+from collections import OrderedDict, deque
+from typing import List, Optional, Set, Tuple
+import numpy as np
 from .individual import Individual
 from .population import Population
 from .problem import TSPProblem
@@ -13,19 +14,36 @@ class DiversityManager:
     """Manages population diversity and adaptive mechanisms."""
     
     def __init__(self, min_diversity_threshold: float = 0.3, 
-                 stagnation_threshold: int = 20):
+                 stagnation_threshold: int = 20, fitness_cache_size: int = 1000,
+                 seed: Optional[int] = None, convergence_window: int = 30,
+                 convergence_tolerance: float = 1e-3):
         """
         Initialize diversity manager.
         
         Args:
             min_diversity_threshold: Minimum diversity ratio to maintain
             stagnation_threshold: Generations without improvement before adaptation
+            fitness_cache_size: Maximum number of tour distances kept in the LRU cache
+            seed: Seed for this manager's own random generator
+            convergence_window: Generations of best distances checked for convergence
+            convergence_tolerance: Relative improvement over the window below which
+                                   the run counts as converged
         """
+        self.rng = np.random.default_rng(seed)
         self.min_diversity_threshold = min_diversity_threshold
         self.stagnation_threshold = stagnation_threshold
         self.stagnation_counter = 0
-        self.best_fitness_history = []
+        self.convergence_window = convergence_window
+        self.convergence_tolerance = convergence_tolerance
+        # Partial restarts done so far and generations recorded since the last one;
+        # no convergence stop until a restart has had time to pay off
+        self.restart_count = 0
+        self.generations_since_restart = 0
+        # Only recent values are needed, keep a bounded window
+        self.best_fitness_history = deque(maxlen=max(stagnation_threshold * 4, convergence_window, 256))
         self.last_best_fitness = float('inf')
+        self.fitness_cache_size = fitness_cache_size
+        self.fitness_cache: OrderedDict[bytes, float | int] = OrderedDict()
     
     def update_stagnation_counter(self, current_best_fitness: float):
         """Update stagnation counter based on fitness improvement."""
@@ -38,11 +56,64 @@ class DiversityManager:
             self.stagnation_counter += 1
         
         self.best_fitness_history.append(current_best_fitness)
+        self.generations_since_restart += 1
+    
+    def evaluate_cached(self, individuals: List[Individual], problem: TSPProblem):
+        """
+        Evaluate fitness of individuals, reusing cached distances of previously seen tours.
+        
+        Tours missing from the cache are evaluated together in one batched gather.
+        """
+        misses = []
+        for ind in individuals:
+            key = ind.tour.tobytes()
+            distance = self.fitness_cache.get(key)
+            if distance is None:
+                misses.append((ind, key))
+            else:
+                self.fitness_cache.move_to_end(key)
+                ind.set_distance(distance)
+        
+        if not misses:
+            return
+        
+        distances = problem.calculate_tour_distances(np.stack([ind.tour for ind, _ in misses]))
+        for (ind, key), distance in zip(misses, distances.tolist()):
+            ind.set_distance(distance)
+            self.fitness_cache[key] = distance
+            if len(self.fitness_cache) > self.fitness_cache_size:
+                self.fitness_cache.popitem(last=False)
     
     def is_stagnated(self) -> bool:
         """Check if algorithm is stagnated."""
         return self.stagnation_counter >= self.stagnation_threshold
     
+    def has_converged(self) -> bool:
+        """
+        Check whether the best distance has flattened out.
+        
+        Converged when a partial restart has been tried and has had
+        `stagnation_threshold` generations to pay off, the relative improvement
+        over the last `convergence_window` generations is below
+        `convergence_tolerance` and the last 20 best values vary by less than
+        2% (noise guard).
+        """
+        if self.restart_count == 0 or self.generations_since_restart < self.stagnation_threshold:
+            return False
+        
+        window = self.convergence_window
+        if len(self.best_fitness_history) < window:
+            return False
+        
+        recent = np.array(self.best_fitness_history, dtype=np.float64)[-window:]
+        if not np.all(np.isfinite(recent)) or recent[0] <= 0:
+            return False
+        
+        rel_improvement = (recent[0] - recent[-1]) / recent[0]
+        tail = recent[-20:]
+        rel_spread = tail.std() / tail.mean()
+        return rel_improvement < self.convergence_tolerance and rel_spread < 0.02
+    
     def get_stagnation_level(self) -> int:
         """Get current stagnation level."""
         return self.stagnation_counter
@@ -62,60 +133,65 @@ class DiversityManager:
             return {'unique_ratio': 0.0, 'hamming_diversity': 0.0, 'fitness_variance': 0.0}
         
         # Unique individuals ratio
-        unique_tours = set(tuple(ind.tour) for ind in population.individuals)
-        unique_ratio = len(unique_tours) / n
+        unique_count = population.unique_tours()[0]
+        unique_ratio = unique_count / n
         
         # Average Hamming distance between tours
         hamming_diversity = self._calculate_hamming_diversity(population.individuals)
         
-        # Fitness variance
-        fitness_values = [ind.distance for ind in population.individuals if ind.distance is not None]
-        if len(fitness_values) > 1:
-            mean_fitness = sum(fitness_values) / len(fitness_values)
-            fitness_variance = sum((f - mean_fitness) ** 2 for f in fitness_values) / len(fitness_values)
-        else:
-            fitness_variance = 0.0
+        # Fitness variance (unevaluated individuals are stored as inf)
+        fitness_values = population.distances[np.isfinite(population.distances)]
+        fitness_variance = float(np.var(fitness_values)) if fitness_values.size > 1 else 0.0
         
         return {
             'unique_ratio': unique_ratio,
             'hamming_diversity': hamming_diversity,
             'fitness_variance': fitness_variance,
-            'unique_count': len(unique_tours)
+            'unique_count': unique_count
         }
     
     def _calculate_hamming_diversity(self, individuals: List[Individual]) -> float:
         """Calculate average Hamming distance between all pairs of tours."""
-        if len(individuals) < 2:
+        num_individuals = len(individuals)
+        if num_individuals < 2:
             return 0.0
         
-        total_distance = 0
-        comparisons = 0
-        tour_length = len(individuals[0].tour)
+        # One row per position, each row sorted so equal cities form runs (O(N*L) memory)
+        by_position = np.sort(np.stack([ind.tour for ind in individuals], axis=1), axis=1)
+        tour_length = by_position.shape[0]
+        flat = by_position.ravel()
         
-        for i in range(len(individuals)):
-            for j in range(i + 1, len(individuals)):
-                # Calculate Hamming distance (number of different positions)
-                hamming_dist = sum(1 for k in range(tour_length) 
-                                 if individuals[i].tour[k] != individuals[j].tour[k])
-                total_distance += hamming_dist / tour_length  # Normalize by tour length
-                comparisons += 1
+        # A run starts where the city changes or a new position begins
+        run_start = np.empty(flat.size, dtype=bool)
+        run_start[0] = True
+        np.not_equal(flat[1:], flat[:-1], out=run_start[1:])
+        run_start[::num_individuals] = True
+        starts = np.flatnonzero(run_start)
+        run_lengths = np.diff(np.append(starts, flat.size))
         
-        return total_distance / comparisons if comparisons > 0 else 0.0
+        # Fraction of pairs that differ at each position, averaged over positions
+        equal_pairs = int((run_lengths * (run_lengths - 1)).sum())
+        total_pairs = num_individuals * (num_individuals - 1)
+        return float(1.0 - equal_pairs / (tour_length * total_pairs))
     
-    def maintain_diversity(self, population: Population, problem: TSPProblem) -> Population:
+    def maintain_diversity(self, population: Population, problem: TSPProblem,
+                           unique_ratio: Optional[float] = None) -> Population:
         """
         Maintain population diversity by removing duplicates and adding variation.
         
         Args:
             population: Current population
             problem: TSP problem instance
+            unique_ratio: Unique tour ratio if already computed for this population
             
         Returns:
             Population with maintained diversity
         """
-        diversity_metrics = self.calculate_diversity_metrics(population)
+        # Only the unique ratio is needed here, not the full (Hamming, variance) metrics
+        if unique_ratio is None:
+            unique_ratio = population.calculate_diversity()
         
-        if diversity_metrics['unique_ratio'] < self.min_diversity_threshold:
+        if unique_ratio < self.min_diversity_threshold:
             # Diversity is too low, take action
             population = self._increase_diversity(population, problem)
         
@@ -124,44 +200,49 @@ class DiversityManager:
     def _increase_diversity(self, population: Population, problem: TSPProblem) -> Population:
         """Increase population diversity."""
         # Remove exact duplicates and replace with mutated versions
-        seen_tours = set()
         new_individuals = []
+        mutated_individuals = []
         
         # Sort by fitness to keep best individuals
         population.sort_by_fitness()
         
-        for ind in population.individuals:
-            tour_tuple = tuple(ind.tour)
-            if tour_tuple not in seen_tours:
-                seen_tours.add(tour_tuple)
+        # Keep the first (best, after sorting) occurrence of each distinct tour
+        is_first = np.zeros(len(population.individuals), dtype=np.bool_)
+        is_first[population.unique_tours()[1]] = True
+        
+        for ind, keep in zip(population.individuals, is_first.tolist()):
+            if keep:
                 new_individuals.append(ind)
             else:
                 # Replace duplicate with heavily mutated version
                 mutated = self._heavy_mutate(ind)
-                mutated.evaluate_fitness(problem)
+                mutated_individuals.append(mutated)
                 new_individuals.append(mutated)
         
+        self.evaluate_cached(mutated_individuals, problem)
+        
         return Population(new_individuals)
     
     def _heavy_mutate(self, individual: Individual) -> Individual:
         """Apply heavy mutation to increase diversity."""
         mutated = individual.copy()
+        tour = mutated.tour
+        n = tour.size
         
-        # Apply multiple mutations
-        num_mutations = random.randint(2, 5)
+        if n < 2:
+            return mutated
+        
+        # Apply multiple mutations directly on the tour array
+        num_mutations = int(self.rng.integers(2, 6))
         for _ in range(num_mutations):
-            if random.random() < 0.5:
+            if self.rng.random() < 0.5:
                 # Swap mutation
-                n = len(mutated.tour)
-                if n >= 2:
-                    pos1, pos2 = random.sample(range(n), 2)
-                    mutated.tour[pos1], mutated.tour[pos2] = mutated.tour[pos2], mutated.tour[pos1]
+                pos1, pos2 = self.rng.choice(n, 2, replace=False)
+                tour[[pos1, pos2]] = tour[[pos2, pos1]]
             else:
-                # Inversion mutation
-                n = len(mutated.tour)
-                if n >= 2:
-                    cut1, cut2 = sorted(random.sample(range(n), 2))
-                    mutated.tour[cut1:cut2+1] = reversed(mutated.tour[cut1:cut2+1])
+                # Inversion mutation (reversed slice view)
+                cut1, cut2 = np.sort(self.rng.choice(n, 2, replace=False))
+                tour[cut1:cut2+1] = tour[cut1:cut2+1][::-1]
         
         # Reset fitness
         mutated.fitness = None
@@ -201,12 +282,9 @@ class DiversityManager:
         good_individuals = population.individuals[:split_point]
         bad_individuals = population.individuals[split_point:]
         
-        # Apply adaptive mutation to bad individuals
-        mutated_individuals = []
-        for ind in bad_individuals:
-            mutated = adaptive_mutate(ind, self.stagnation_counter)
-            mutated.evaluate_fitness(problem)
-            mutated_individuals.append(mutated)
+        # Apply adaptive mutation to bad individuals, then evaluate them as one batch
+        mutated_individuals = [adaptive_mutate(ind, self.stagnation_counter) for ind in bad_individuals]
+        self.evaluate_cached(mutated_individuals, problem)
         
         new_individuals = good_individuals + mutated_individuals
         return Population(new_individuals)
@@ -216,19 +294,23 @@ class DiversityManager:
         population.sort_by_fitness()
         
         # Keep only best 20% of population
-        keep_count = max(1, int(len(population.individuals) * 0.2))
-        elite_individuals = population.individuals[:keep_count]
+        population_size = len(population.individuals)
+        keep_count = max(1, int(population_size * 0.2))
         
-        # Generate new random individuals for the rest
-        new_individuals = list(elite_individuals)
+        # Generate all new random tours at once (argsort of uniform noise is a random permutation)
+        num_new = max(0, population_size - keep_count)
+        random_tours = np.argsort(self.rng.random((num_new, problem.n)), axis=1).astype(np.int32)
+        distances = problem.calculate_tour_distances(random_tours)
         
-        while len(new_individuals) < len(population.individuals):
-            # Create new individual
-            new_ind = Individual(n=problem.n)
-            new_ind.evaluate_fitness(problem)
+        new_individuals = population.individuals[:keep_count]
+        for tour, distance in zip(random_tours, distances.tolist()):
+            new_ind = Individual(tour=tour)
+            new_ind.set_distance(distance)
             new_individuals.append(new_ind)
         
         # Reset stagnation counter after restart
         self.stagnation_counter = 0
+        self.restart_count += 1
+        self.generations_since_restart = 0
         
         return Population(new_individuals)
\ No newline at end of file
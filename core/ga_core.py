@@ -1,8 +1,11 @@
 """
 Main genetic algorithm core module.
 """
+import multiprocessing
 import random
 import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 from typing import Optional, List, Callable, Any
 
 from .problem import TSPProblem
@@ -12,6 +15,20 @@ from .population import initialize_population
 from .replacement import create_new_generation
 from .diversity import DiversityManager
 
+# Main operators re-exported as specified in the requirements (single definitions)
+from .selection import select_tournament
+from .crossover import crossover_ox, crossover_pmx
+from .mutation import mutate_swap, mutate_inversion
+
+__all__ = [
+    'run_ga',
+    'select_tournament',
+    'crossover_ox',
+    'crossover_pmx',
+    'mutate_swap',
+    'mutate_inversion',
+]
+
 
 def run_ga(problem: TSPProblem, config: GAConfig, 
           callbacks: Optional[List[Callable]] = None) -> GAResult:
@@ -21,7 +38,8 @@ def run_ga(problem: TSPProblem, config: GAConfig,
     Args:
         problem: TSP problem instance
         config: GA configuration
-        callbacks: Optional list of callback functions called each iteration
+        callbacks: Optional list of callback functions called each iteration with a
+                   state dict ('best_route' is a read-only int32 array view)
         
     Returns:
         GA results with best solution and history
@@ -29,6 +47,7 @@ def run_ga(problem: TSPProblem, config: GAConfig,
     # Set random seed for reproducibility
     if config.seed is not None:
         random.seed(config.seed)
+        np.random.seed(config.seed)
     
     # Initialize result object
     result = GAResult()
@@ -36,7 +55,12 @@ def run_ga(problem: TSPProblem, config: GAConfig,
     # Initialize diversity manager
     diversity_manager = DiversityManager(
         min_diversity_threshold=0.3,
-        stagnation_threshold=20
+        stagnation_threshold=20,
+        fitness_cache_size=10 * config.N,
+        seed=config.seed,
+        # Spans about three 50-generation restart cycles: on berlin52, restarts
+        # often pay off only after 100+ flat generations
+        convergence_window=max(150, config.maxIter // 4)
     )
     
     # Initialize population
@@ -49,72 +73,94 @@ def run_ga(problem: TSPProblem, config: GAConfig,
     
     print(f"Initial best distance: {result.best_distance}")
     
-    # Evolution loop
-    start_time = time.time()
+    # Worker pool for parallel fitness evaluation, reused across generations
+    # (spawned, since forking after the compiled kernels start their thread pool can deadlock)
+    executor = None
+    if config.max_workers:
+        executor = ProcessPoolExecutor(max_workers=config.max_workers,
+                                       mp_context=multiprocessing.get_context("spawn"))
     
-    for generation in range(config.maxIter):
-        # Calculate population statistics
-        best_individual = population.get_best()
-        avg_distance = population.get_average_distance()
-        diversity_metrics = diversity_manager.calculate_diversity_metrics(population)
-        
-        # Update best solution if improved
-        result.update_best(best_individual.tour, best_individual.distance)
-        
-        # Update stagnation counter
-        diversity_manager.update_stagnation_counter(best_individual.distance)
-        
-        # Add iteration to history
-        result.add_iteration(
-            generation,
-            best_individual.distance,
-            avg_distance,
-            diversity_metrics['unique_ratio']
-        )
+    # Evolution loop
+    # (the pool is shut down even if the loop raises or is interrupted)
+    try:
+        start_time = time.time()
         
-        # Call callbacks if provided
-        if callbacks:
-            callback_state = {
-                'iter': generation,
-                'best_route': best_individual.tour.copy(),
-                'best_distance': best_individual.distance,
-                'avg_distance': avg_distance,
-                'population': population.individuals.copy(),
-                'diversity': diversity_metrics,
-                'stagnation': diversity_manager.get_stagnation_level()
-            }
+        for generation in range(config.maxIter):
+            # Calculate population statistics (best, average and unique ratio in one pass)
+            best_individual, avg_distance, unique_ratio = population.compute_stats()
             
-            for callback in callbacks:
-                try:
-                    callback(callback_state)
-                except Exception as e:
-                    print(f"Warning: Callback error in generation {generation}: {e}")
-        
-        # Print progress periodically
-        if generation % 100 == 0 or generation < 10:
-            elapsed = time.time() - start_time
-            print(f"Gen {generation:4d}: Best={best_individual.distance:8.1f}, "
-                  f"Avg={avg_distance:8.1f}, Diversity={diversity_metrics['unique_ratio']:.3f}, "
-                  f"Stagnation={diversity_manager.get_stagnation_level()}, "
-                  f"Time={elapsed:.1f}s")
-        
-        # Early stopping if we haven't improved for a very long time
-        if diversity_manager.get_stagnation_level() > config.maxIter // 4:
-            print(f"Early stopping at generation {generation} due to stagnation")
-            break
-        
-        # Maintain diversity
-        population = diversity_manager.maintain_diversity(population, problem)
-        
-        # Apply adaptive mechanisms if stagnated
-        population = diversity_manager.apply_adaptive_mechanisms(population, problem)
-        
-        # Create new generation
-        population = create_new_generation(population, problem, config)
-        
-        # Remove duplicates periodically
-        if generation % 50 == 0:
-            population.remove_duplicates(problem)
+            # Update best solution if improved
+            result.update_best(best_individual.tour, best_individual.distance)
+            
+            # Update stagnation counter
+            diversity_manager.update_stagnation_counter(best_individual.distance)
+            
+            # Add iteration to history
+            result.add_iteration(
+                generation,
+                best_individual.distance,
+                avg_distance,
+                unique_ratio
+            )
+            
+            # Call callbacks if provided
+            if callbacks:
+                # The individuals list is never modified in place after this point (later
+                # steps build new Population objects), so it is shared rather than copied.
+                # best_route is a read-only view of the best tour; callbacks that keep it
+                # past the call must copy it (the visualizer copies into its own array)
+                best_route = best_individual.tour.view()
+                best_route.flags.writeable = False
+                callback_state = {
+                    'iter': generation,
+                    'best_route': best_route,
+                    'best_distance': best_individual.distance,
+                    'avg_distance': avg_distance,
+                    'population': population.individuals,
+                    'diversity': diversity_manager.calculate_diversity_metrics(population),
+                    'stagnation': diversity_manager.get_stagnation_level()
+                }
+                
+                for callback in callbacks:
+                    try:
+                        callback(callback_state)
+                    except Exception as e:
+                        print(f"Warning: Callback error in generation {generation}: {e}")
+            
+            # Print progress periodically
+            if generation % 100 == 0 or generation < 10:
+                elapsed = time.time() - start_time
+                print(f"Gen {generation:4d}: Best={best_individual.distance:8.1f}, "
+                      f"Avg={avg_distance:8.1f}, Diversity={unique_ratio:.3f}, "
+                      f"Stagnation={diversity_manager.get_stagnation_level()}, "
+                      f"Time={elapsed:.1f}s")
+            
+            # Early stopping once the best distance has flattened over the recent window
+            # (skips all remaining maintenance and breeding work); the plain stagnation
+            # bound still stops runs too short to ever reach a partial restart
+            if (diversity_manager.has_converged()
+                    or diversity_manager.get_stagnation_level() > config.maxIter // 4):
+                print(f"Early stopping at generation {generation} due to stagnation")
+                break
+            
+            # Maintain diversity
+            population = diversity_manager.maintain_diversity(population, problem, unique_ratio)
+            
+            # Apply adaptive mechanisms if stagnated
+            population = diversity_manager.apply_adaptive_mechanisms(population, problem)
+            
+            # Create new generation
+            # Offspring go through the diversity manager's distance cache, since late
+            # generations repeat many tours (elites, children identical to a parent)
+            population = create_new_generation(population, problem, config, executor,
+                                               evaluate=diversity_manager.evaluate_cached)
+            
+            # Remove duplicates periodically
+            if generation % 50 == 0:
+                population.remove_duplicates(problem)
+    finally:
+        if executor is not None:
+            executor.shutdown()
     
     # Final statistics
     final_best = population.get_best()
@@ -126,34 +172,3 @@ def run_ga(problem: TSPProblem, config: GAConfig,
     print(f"Total generations: {len(result.history)}")
     
     return result
-
-
-# Export main functions as specified in the requirements
-def select_tournament(population, k=3):
-    """Tournament selection (wrapper for compatibility)."""
-    from .selection import select_tournament as _select_tournament
-    return _select_tournament(population, k)
-
-
-def crossover_ox(parent1, parent2):
-    """Order crossover (wrapper for compatibility)."""
-    from .crossover import crossover_ox as _crossover_ox
-    return _crossover_ox(parent1, parent2)
-
-
-def crossover_pmx(parent1, parent2):
-    """Partially mapped crossover (wrapper for compatibility)."""
-    from .crossover import crossover_pmx as _crossover_pmx
-    return _crossover_pmx(parent1, parent2)
-
-
-def mutate_swap(individual):
-    """Swap mutation (wrapper for compatibility)."""
-    from .mutation import mutate_swap as _mutate_swap
-    return _mutate_swap(individual)
-
-
-def mutate_inversion(individual):
-    """Inversion mutation (wrapper for compatibility)."""
-    from .mutation import mutate_inversion as _mutate_inversion
-    return _mutate_inversion(individual)
\ No newline at end of file
@@ -1,28 +1,34 @@
 """
 Individual representation and fitness functions for TSP genetic algorithm.
 """
-import random
 from typing import Optional
+import numpy as np
 from .problem import TSPProblem
+from ._kernels import NUMBA_AVAILABLE, nearest_neighbor_tour
 
 
 class Individual:
     """Represents an individual in the genetic algorithm (TSP tour)."""
     
-    def __init__(self, tour: Optional[list[int]] = None, n: Optional[int] = None):
+    def __init__(self, tour: Optional[list[int] | np.ndarray] = None, n: Optional[int] = None,
+                 copy_tour: bool = True):
         """
         Initialize individual.
         
         Args:
-            tour: Tour as permutation of city indices (0 to n-1)
+            tour: Tour as permutation of city indices (0 to n-1), stored as int32 array
             n: Number of cities (used for random initialization if tour not provided)
+            copy_tour: Copy the given tour; pass False to wrap a freshly built
+                       int32 array (e.g. a row of an offspring buffer) without copying
         """
         if tour is not None:
-            self.tour = tour.copy()
-            self.n = len(tour)
+            if copy_tour:
+                self.tour = np.array(tour, dtype=np.int32)
+            else:
+                self.tour = np.asarray(tour, dtype=np.int32)
+            self.n = len(self.tour)
         elif n is not None:
-            self.tour = list(range(n))
-            random.shuffle(self.tour)
+            self.tour = np.random.permutation(n).astype(np.int32)
             self.n = n
         else:
             raise ValueError("Either tour or n must be provided")
@@ -32,15 +38,26 @@ class Individual:
     
     def evaluate_fitness(self, problem: TSPProblem):
         """Evaluate fitness (tour distance) using problem instance."""
-        self.distance = problem.calculate_tour_distance(self.tour)
+        self.set_distance(problem.calculate_tour_distance(self.tour))
+    
+    def set_distance(self, distance: float | int):
+        """Set an already computed tour distance and derive fitness from it."""
+        self.distance = distance
         # Fitness is inverse of distance (higher fitness = shorter distance)
-        self.fitness = 1.0 / (1.0 + self.distance)
+        self.fitness = 1.0 / (1.0 + distance)
     
     def is_valid_tour(self) -> bool:
         """Check if tour is a valid permutation."""
-        return (len(self.tour) == self.n and 
-                set(self.tour) == set(range(self.n)) and
-                len(set(self.tour)) == self.n)
+        if self.tour.size != self.n:
+            return False
+        if self.n == 0:
+            return True
+        if self.tour.min() < 0 or self.tour.max() >= self.n:
+            return False
+        # Bitmap of visited cities: n cities all marked iff no city is repeated
+        visited = np.zeros(self.n, dtype=np.bool_)
+        visited[self.tour] = True
+        return bool(visited.all())
     
     def copy(self) -> 'Individual':
         """Create a deep copy of the individual."""
@@ -57,11 +74,11 @@ class Individual:
     
     def __eq__(self, other: 'Individual') -> bool:
         """Check if two individuals have the same tour."""
-        return self.tour == other.tour
+        return np.array_equal(self.tour, other.tour)
     
     def __hash__(self) -> int:
         """Hash based on tour for set operations."""
-        return hash(tuple(self.tour))
+        return hash(self.tour.tobytes())
     
     def __repr__(self) -> str:
         """String representation."""
@@ -76,17 +93,25 @@ def create_random_individual(n: int) -> Individual:
 def create_greedy_individual(problem: TSPProblem, start_city: int = 0) -> Individual:
     """Create greedy nearest neighbor individual."""
     n = problem.n
-    tour = [start_city]
-    remaining = set(range(n)) - {start_city}
+    tour = np.empty(n, dtype=np.int32)
     
-    current_city = start_city
-    while remaining:
-        # Find nearest unvisited city
-        nearest_city = min(remaining, key=lambda city: problem.get_distance(current_city, city))
-        tour.append(nearest_city)
-        remaining.remove(nearest_city)
-        current_city = nearest_city
+    if NUMBA_AVAILABLE:
+        # Compiled scan over a visited mask, no per-step array temporaries
+        nearest_neighbor_tour(problem.dist, start_city, tour)
+    else:
+        tour[0] = start_city
+        unvisited = np.ones(n, dtype=np.bool_)
+        unvisited[start_city] = False
+        
+        current_city = start_city
+        for step in range(1, n):
+            # Find nearest unvisited city (visited ones masked out with inf)
+            row = np.where(unvisited, problem.dist[current_city], np.inf)
+            nearest_city = int(np.argmin(row))
+            tour[step] = nearest_city
+            unvisited[nearest_city] = False
+            current_city = nearest_city
     
-    individual = Individual(tour=tour)
+    individual = Individual(tour=tour, copy_tour=False)
     individual.evaluate_fitness(problem)
     return individual
\ No newline at end of file
@@ -2,8 +2,11 @@
 Mutation operators for genetic algorithm (TSP).
 """
 import random
-from typing import List
+from typing import List, Optional
+import numpy as np
 from .individual import Individual
+from .problem import TSPProblem
+from ._kernels import swap_positions, reverse_segment, batch_reverse_segments, batch_invert_with_delta
 
 
 def mutate_swap(individual: Individual) -> Individual:
@@ -31,7 +34,7 @@ def mutate_swap(individual: Individual) -> Individual:
         pos2 = random.randint(0, n - 1)
     
     # Swap cities at selected positions
-    mutated.tour[pos1], mutated.tour[pos2] = mutated.tour[pos2], mutated.tour[pos1]
+    swap_positions(mutated.tour, pos1, pos2)
     
     # Reset fitness (needs to be recalculated)
     mutated.fitness = None
@@ -40,7 +43,7 @@ def mutate_swap(individual: Individual) -> Individual:
     return mutated
 
 
-def mutate_inversion(individual: Individual) -> Individual:
+def mutate_inversion(individual: Individual, problem: Optional[TSPProblem] = None) -> Individual:
     """
     Inversion mutation (2-opt): reverse the order of cities between two points.
     
@@ -48,6 +51,9 @@ def mutate_inversion(individual: Individual) -> Individual:
     
     Args:
         individual: Individual to mutate
+        problem: Optional TSP problem; if given (symmetric distances) and the
+                 individual is evaluated, the new distance is derived from the
+                 2-opt delta in O(1) instead of being reset
         
     Returns:
         Mutated individual (new copy)
@@ -73,16 +79,36 @@ def mutate_inversion(individual: Individual) -> Individual:
         else:
             cut1 = cut1 - 1
     
+    # 2-opt delta: only the two edges around the segment change
+    delta = None
+    if problem is not None and problem.symmetric and mutated.distance is not None:
+        delta = _inversion_delta(mutated.tour, cut1, cut2, problem)
+    
     # Reverse the segment between cut1 and cut2 (inclusive)
-    mutated.tour[cut1:cut2+1] = reversed(mutated.tour[cut1:cut2+1])
+    reverse_segment(mutated.tour, cut1, cut2)
     
-    # Reset fitness (needs to be recalculated)
-    mutated.fitness = None
-    mutated.distance = None
+    if delta is not None:
+        mutated.set_distance(mutated.distance + delta)
+    else:
+        # Reset fitness (needs to be recalculated)
+        mutated.fitness = None
+        mutated.distance = None
     
     return mutated
 
 
+def _inversion_delta(tour, cut1: int, cut2: int, problem: TSPProblem) -> float | int:
+    """Distance change from reversing tour[cut1:cut2+1] (symmetric distances)."""
+    n = len(tour)
+    if cut2 - cut1 + 1 >= n:
+        # Reversing the whole tour keeps every edge
+        return 0
+    a, b = tour[cut1 - 1], tour[cut1]
+    c, d = tour[cut2], tour[(cut2 + 1) % n]
+    return (problem.get_distance(a, c) + problem.get_distance(b, d)
+            - problem.get_distance(a, b) - problem.get_distance(c, d))
+
+
 def mutate_scramble(individual: Individual) -> Individual:
     """
     Scramble mutation: randomly shuffle cities in a randomly selected segment.
@@ -121,45 +147,113 @@ def mutate_scramble(individual: Individual) -> Individual:
     return mutated
 
 
+_MUTATION_METHODS = {"swap", "inversion", "scramble"}
+
+
 def create_offspring_mutation(parents: List[Individual], num_offspring: int,
-                             method: str = "inversion", mutation_rate: float = 0.1) -> List[Individual]:
+                             method: str = "inversion", mutation_rate: float = 0.1,
+                             problem: Optional[TSPProblem] = None) -> List[Individual]:
     """
     Create offspring using mutation.
     
+    All random decisions (parents, whether to mutate, positions) are drawn up
+    front as arrays and applied to a matrix of copied parent tours.
+    
     Args:
         parents: List of parent individuals
         num_offspring: Number of offspring to create
         method: Mutation method ("swap", "inversion", or "scramble")
         mutation_rate: Probability of actually applying mutation
+        problem: Optional TSP problem, lets inversion offspring arrive already evaluated
         
     Returns:
         List of offspring
     """
-    offspring = []
+    if method not in _MUTATION_METHODS:
+        raise ValueError(f"Unknown mutation method: {method}")
+    if num_offspring <= 0:
+        return []
     
-    for _ in range(num_offspring):
-        # Select random parent
-        parent = random.choice(parents)
-        
-        # Apply mutation with given probability
-        if random.random() < mutation_rate:
-            if method == "swap":
-                child = mutate_swap(parent)
-            elif method == "inversion":
-                child = mutate_inversion(parent)
-            elif method == "scramble":
-                child = mutate_scramble(parent)
-            else:
-                raise ValueError(f"Unknown mutation method: {method}")
+    parent_tours = np.stack([parent.tour for parent in parents])
+    parent_distances = np.array(
+        [p.distance if p.distance is not None else np.nan for p in parents], dtype=np.float64
+    )
+    n = parent_tours.shape[1]
+    
+    parent_idx = np.random.randint(0, len(parents), size=num_offspring)
+    tours = parent_tours[parent_idx]
+    distances = parent_distances[parent_idx]
+    apply = np.random.random(num_offspring) < mutation_rate
+    
+    if n >= 2:
+        if method == "inversion":
+            distances = _invert_rows(tours, distances, apply, problem)
+        elif method == "swap":
+            _swap_rows(tours, apply)
+            distances[apply] = np.nan
         else:
-            # No mutation, just copy parent
-            child = parent.copy()
-        
+            _scramble_rows(tours, apply)
+            distances[apply] = np.nan
+    
+    offspring = []
+    for tour, distance in zip(tours, distances.tolist()):
+        child = Individual(tour=tour, copy_tour=False)
+        if distance == distance:  # not NaN
+            child.set_distance(distance)
         offspring.append(child)
     
     return offspring
 
 
+def _swap_rows(tours: np.ndarray, apply: np.ndarray):
+    """Swap two distinct random positions in every row selected by apply."""
+    rows = np.flatnonzero(apply)
+    n = tours.shape[1]
+    pos1 = np.random.randint(0, n, size=rows.size)
+    # Non-zero offset keeps the second position distinct from the first
+    pos2 = (pos1 + np.random.randint(1, n, size=rows.size)) % n
+    tours[rows, pos1], tours[rows, pos2] = tours[rows, pos2], tours[rows, pos1]
+
+
+def _invert_rows(tours: np.ndarray, distances: np.ndarray, apply: np.ndarray,
+                 problem: Optional[TSPProblem] = None) -> np.ndarray:
+    """
+    Reverse a random segment in every row selected by apply (one kernel call).
+    
+    Returns:
+        Updated distances: 2-opt deltas applied when possible, NaN otherwise
+    """
+    num_rows, n = tours.shape
+    
+    # Sorted cut points; equal cuts become a two-city inversion as in mutate_inversion
+    cuts = np.sort(np.random.randint(0, n, size=(num_rows, 2)), axis=1)
+    same = cuts[:, 0] == cuts[:, 1]
+    at_end = same & (cuts[:, 0] == n - 1)
+    cuts[at_end, 0] -= 1
+    cuts[same & ~at_end, 1] += 1
+    # Unmutated rows get an empty (no-op) segment
+    cuts[~apply] = 0
+    
+    if problem is not None and problem.symmetric:
+        # Reversal and 2-opt delta of every row in one parallel kernel call
+        distances = distances.copy()
+        batch_invert_with_delta(tours, cuts, problem.dist, distances)
+        return distances
+    
+    batch_reverse_segments(tours, cuts)
+    return np.where(apply, np.nan, distances)
+
+
+def _scramble_rows(tours: np.ndarray, apply: np.ndarray):
+    """Shuffle a random segment in every row selected by apply."""
+    n = tours.shape[1]
+    rows = np.flatnonzero(apply)
+    cuts = np.sort(np.random.randint(0, n, size=(rows.size, 2)), axis=1)
+    for row, (cut1, cut2) in zip(rows.tolist(), cuts.tolist()):
+        segment = tours[row, cut1:cut2+1]
+        tours[row, cut1:cut2+1] = segment[np.random.permutation(segment.size)]
+
+
 def adaptive_mutate(individual: Individual, stagnation_generations: int,
                    base_method: str = "inversion") -> Individual:
     """
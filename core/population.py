@@ -1,57 +1,206 @@
 """
 Population initialization and management for genetic algorithm.
 """
+import os
 import random
-from typing import List
+from concurrent.futures import Executor
+from itertools import repeat
+from typing import List, Optional, Tuple
+import numpy as np
 from .individual import Individual, create_random_individual, create_greedy_individual
 from .problem import TSPProblem
 from .config import GAConfig
 
 
+# Below this many individuals, inter-process overhead outweighs parallel evaluation
+MIN_PARALLEL_EVALUATION = 32
+
+
+def _eval_worker(tours: np.ndarray, problem: TSPProblem) -> np.ndarray:
+    """Evaluate a chunk of tours in a worker process (module-level so it can be pickled)."""
+    return problem.calculate_tour_distances(tours)
+
+
+def evaluate_individuals(individuals: List[Individual], problem: TSPProblem,
+                         executor: Optional[Executor] = None,
+                         num_workers: Optional[int] = None):
+    """
+    Evaluate fitness for a list of individuals.
+    
+    Args:
+        individuals: Individuals to evaluate
+        problem: TSP problem instance
+        executor: Optional executor (e.g. ProcessPoolExecutor) used to evaluate
+                  chunks of tours in parallel for large batches
+        num_workers: Worker count of the executor, used to size the chunks
+                     (defaults to the number of cores)
+    """
+    if not individuals:
+        return
+    
+    tours = np.stack([ind.tour for ind in individuals])
+    if executor is None or len(individuals) < MIN_PARALLEL_EVALUATION:
+        # Whole batch in one vectorized call
+        distances = problem.calculate_tour_distances(tours)
+    else:
+        # About one chunk per worker so the problem is pickled a few times, not once per tour
+        num_chunks = num_workers or os.cpu_count() or 1
+        chunks = np.array_split(tours, num_chunks)
+        distances = np.concatenate(list(executor.map(_eval_worker, chunks, repeat(problem))))
+    
+    for individual, distance in zip(individuals, distances.tolist()):
+        individual.set_distance(distance)
+
+
 class Population:
-    """Manages a population of individuals."""
+    """
+    Manages a population of individuals.
+    
+    Tours are stored contiguously in a (N, L) int32 matrix (`tours`) with a
+    matching `distances` vector (and `fitnesses` = 1 / (1 + distances));
+    each individual's tour is a row view of it.
+    """
     
     def __init__(self, individuals: List[Individual]):
         """Initialize population with list of individuals."""
         self.individuals = individuals
         self.size = len(individuals)
+        self._build_arrays()
+    
+    def _build_arrays(self):
+        """Pack individual tours and distances into contiguous arrays."""
+        if self.individuals:
+            self.tours = np.stack([ind.tour for ind in self.individuals])
+        else:
+            self.tours = np.empty((0, 0), dtype=np.int32)
+        
+        self.distances = np.array(
+            [ind.distance if ind.distance is not None else np.inf for ind in self.individuals],
+            dtype=np.float64
+        )
+        # Fitness vector derived once from distances (unevaluated -> 0.0)
+        self.fitnesses = 1.0 / (1.0 + self.distances)
+        
+        # Individuals become lightweight views over the tours matrix
+        for i, ind in enumerate(self.individuals):
+            ind.tour = self.tours[i]
+        
+        # Whether the arrays are currently in sort_by_fitness order
+        self._sorted = False
     
-    def evaluate_all(self, problem: TSPProblem):
-        """Evaluate fitness for all individuals in population."""
-        for individual in self.individuals:
-            individual.evaluate_fitness(problem)
+    def evaluate_all(self, problem: TSPProblem, executor: Optional[Executor] = None,
+                     num_workers: Optional[int] = None):
+        """Evaluate fitness for all individuals in population (optionally in parallel)."""
+        self._sorted = False
+        if executor is not None:
+            evaluate_individuals(self.individuals, problem, executor, num_workers)
+            for i, individual in enumerate(self.individuals):
+                self.distances[i] = individual.distance
+            self.fitnesses = 1.0 / (1.0 + self.distances)
+            return
+        
+        # Tours are already packed row-wise, so evaluate the whole matrix at once
+        self.distances = problem.calculate_tour_distances(self.tours)
+        self.fitnesses = 1.0 / (1.0 + self.distances)
+        for individual, distance, fitness in zip(self.individuals, self.distances.tolist(),
+                                                 self.fitnesses.tolist()):
+            individual.distance = distance
+            individual.fitness = fitness
     
     def sort_by_fitness(self):
         """Sort population by fitness (best first - shortest distance)."""
-        self.individuals.sort(key=lambda ind: ind.distance if ind.distance is not None else float('inf'))
+        if self._sorted:
+            # Nothing changed since the last sort
+            return
+        
+        order = np.argsort(self.distances, kind='stable')
+        self.tours = self.tours[order]
+        self.distances = self.distances[order]
+        self.fitnesses = self.fitnesses[order]
+        self.individuals = [self.individuals[i] for i in order]
+        
+        for i, ind in enumerate(self.individuals):
+            ind.tour = self.tours[i]
+        self._sorted = True
     
     def get_best(self) -> Individual:
         """Get best individual (shortest distance)."""
-        return min(self.individuals, key=lambda ind: ind.distance if ind.distance is not None else float('inf'))
+        return self.individuals[int(self.distances.argmin())]
+    
+    def get_best_k(self, k: int) -> List[Individual]:
+        """
+        Get the k best individuals, best first (ties keep population order).
+        
+        Uses a partition instead of a full sort, so it is O(N) for small k.
+        """
+        k = min(k, self.size)
+        if k <= 0:
+            return []
+        if self._sorted:
+            return self.individuals[:k]
+        
+        # Everything up to the k-th smallest distance, then a stable sort of just those
+        kth_distance = np.partition(self.distances, k - 1)[k - 1]
+        candidates = np.flatnonzero(self.distances <= kth_distance)
+        order = candidates[np.argsort(self.distances[candidates], kind='stable')][:k]
+        return [self.individuals[i] for i in order.tolist()]
     
     def get_worst(self) -> Individual:
         """Get worst individual (longest distance)."""
-        return max(self.individuals, key=lambda ind: ind.distance if ind.distance is not None else float('inf'))
+        return self.individuals[int(self.distances.argmax())]
     
     def get_average_distance(self) -> float:
         """Get average distance of population."""
-        valid_distances = [ind.distance for ind in self.individuals if ind.distance is not None]
-        return sum(valid_distances) / len(valid_distances) if valid_distances else float('inf')
+        # Unevaluated individuals are stored as inf in the distances vector
+        valid_distances = self.distances[np.isfinite(self.distances)]
+        return float(valid_distances.mean()) if valid_distances.size else float('inf')
+    
+    def unique_tours(self) -> Tuple[int, np.ndarray]:
+        """
+        Find the distinct tours of the population.
+        
+        Returns:
+            Tuple of (number of distinct tours, indices of the first occurrence
+            of each distinct tour in increasing order)
+        """
+        if self.size == 0:
+            return 0, np.empty(0, dtype=np.intp)
+        
+        # Each row as one opaque byte string, so np.unique compares whole tours
+        tours = np.ascontiguousarray(self.tours)
+        rows = tours.view(np.dtype((np.void, tours.shape[1] * tours.itemsize))).ravel()
+        _, first_idx = np.unique(rows, return_index=True)
+        first_idx.sort()
+        return len(first_idx), first_idx
+    
+    def compute_stats(self) -> Tuple[Individual, float, float]:
+        """
+        Compute the per-generation statistics from the population arrays.
+        
+        Returns:
+            Tuple of (best individual, average distance, unique tour ratio)
+        """
+        best = self.individuals[int(np.argmin(self.distances))]
+        
+        evaluated = self.distances[np.isfinite(self.distances)]
+        avg_distance = float(evaluated.mean()) if evaluated.size else float('inf')
+        
+        unique_ratio = self.unique_tours()[0] / self.size
+        
+        return best, avg_distance, unique_ratio
     
     def calculate_diversity(self) -> float:
         """Calculate diversity as percentage of unique individuals."""
-        unique_tours = set(tuple(ind.tour) for ind in self.individuals)
-        return len(unique_tours) / self.size if self.size > 0 else 0.0
+        return self.unique_tours()[0] / self.size if self.size > 0 else 0.0
     
     def remove_duplicates(self, problem: TSPProblem):
         """Remove duplicate individuals and replace with random ones."""
-        seen_tours = set()
-        new_individuals = []
+        is_first = np.zeros(self.size, dtype=np.bool_)
+        is_first[self.unique_tours()[1]] = True
         
-        for ind in self.individuals:
-            tour_tuple = tuple(ind.tour)
-            if tour_tuple not in seen_tours:
-                seen_tours.add(tour_tuple)
+        new_individuals = []
+        for ind, keep in zip(self.individuals, is_first.tolist()):
+            if keep:
                 new_individuals.append(ind)
             else:
                 # Replace duplicate with random individual
@@ -60,6 +209,7 @@ class Population:
                 new_individuals.append(new_ind)
         
         self.individuals = new_individuals
+        self._build_arrays()
     
     def __len__(self) -> int:
         """Get population size."""
@@ -72,6 +222,11 @@ class Population:
     def __setitem__(self, index: int, individual: Individual):
         """Set individual by index."""
         self.individuals[index] = individual
+        self.tours[index] = individual.tour
+        self.distances[index] = individual.distance if individual.distance is not None else np.inf
+        self.fitnesses[index] = 1.0 / (1.0 + self.distances[index])
+        self._sorted = False
+        individual.tour = self.tours[index]
 
 
 def initialize_population(problem: TSPProblem, config: GAConfig) -> Population:
@@ -2,6 +2,8 @@
 TSP Problem representation for genetic algorithm.
 """
 from typing import Optional
+import numpy as np
+from ._kernels import NUMBA_AVAILABLE, tour_distance, batch_tour_distance
 
 
 class TSPProblem:
@@ -17,7 +19,6 @@ class TSPProblem:
             dist: Distance matrix (symmetric NxN)
         """
         self.coords = coords
-        self.dist = dist
         
         if coords is not None:
             self.n = len(coords)
@@ -28,32 +29,70 @@ class TSPProblem:
         
         # Build distance matrix from coordinates if needed
         if coords is not None and dist is None:
-            self.dist = self._build_distance_matrix(coords)
+            dist = self._build_distance_matrix(coords)
+        
+        # Store the matrix in the narrowest type that holds it exactly, to cut
+        # memory traffic of the distance lookups in fitness evaluation
+        dist = np.asarray(dist)
+        self.dist = np.ascontiguousarray(dist, dtype=self._compact_dtype(dist))
+        self.symmetric = bool(np.array_equal(self.dist, self.dist.T))
+    
+    @staticmethod
+    def _compact_dtype(dist: np.ndarray) -> np.dtype:
+        """Pick int16/int32 for integer matrices (by value range), float32 otherwise."""
+        if not np.issubdtype(dist.dtype, np.integer):
+            return np.dtype(np.float32)
+        if dist.size == 0:
+            return np.dtype(np.int16)
+        info = np.iinfo(np.int16)
+        if info.min <= dist.min() and dist.max() <= info.max:
+            return np.dtype(np.int16)
+        return np.dtype(np.int32)
     
-    def _build_distance_matrix(self, coords: list[tuple[float, float]]) -> list[list[float]]:
+    def _build_distance_matrix(self, coords: list[tuple[float, float]]) -> np.ndarray:
         """Build distance matrix from coordinates using Euclidean distance."""
-        n = len(coords)
-        dist = [[0.0] * n for _ in range(n)]
+        points = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        x, y = points[:, 0], points[:, 1]
         
-        for i in range(n):
-            for j in range(i + 1, n):
-                x1, y1 = coords[i]
-                x2, y2 = coords[j]
-                distance = ((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5
-                # Round to nearest integer (TSPLIB convention for EUC_2D)
-                distance = round(distance)
-                dist[i][j] = dist[j][i] = distance
+        # Pairwise distances via broadcasting, one axis at a time so no (n, n, 2)
+        # temporary is materialized
+        distance = np.hypot(x[:, None] - x[None, :], y[:, None] - y[None, :])
         
-        return dist
+        # Round to nearest integer (TSPLIB convention for EUC_2D)
+        return np.rint(distance).astype(np.int32)
     
     def get_distance(self, city1: int, city2: int) -> float | int:
         """Get distance between two cities."""
-        return self.dist[city1][city2]
+        # Convert to a Python number so callers' arithmetic can't overflow int16
+        return self.dist[city1, city2].item()
     
-    def calculate_tour_distance(self, tour: list[int]) -> float | int:
+    def calculate_tour_distance(self, tour: list[int] | np.ndarray) -> float | int:
         """Calculate total distance of a tour (closed loop)."""
-        total_dist = 0
-        n = len(tour)
-        for i in range(n):
-            total_dist += self.get_distance(tour[i], tour[(i + 1) % n])
-        return total_dist
\ No newline at end of file
+        # int32 like Individual tours, so lists (e.g. GAResult.best_route) hit the
+        # same compiled kernel instead of triggering an int64 specialization
+        tour = np.asarray(tour, dtype=np.int32)
+        if tour.size == 0:
+            return 0
+        if NUMBA_AVAILABLE:
+            # Compiled loop: a couple of native loads and adds per edge
+            return tour_distance(tour, self.dist)
+        # Gather all consecutive edges at once, accumulating in float64
+        total_dist = self.dist[tour[:-1], tour[1:]].sum(dtype=np.float64)
+        total_dist += self.dist[tour[-1], tour[0]]
+        return float(total_dist)
+    
+    def calculate_tour_distances(self, tours: np.ndarray) -> np.ndarray:
+        """Calculate total distances of several tours at once (one tour per row)."""
+        tours = np.asarray(tours)
+        if tours.size == 0:
+            return np.zeros(len(tours), dtype=np.float64)
+        if NUMBA_AVAILABLE and tours.ndim == 2:
+            # One compiled pass, rows split across threads
+            distances = np.empty(len(tours), dtype=np.float64)
+            batch_tour_distance(tours, self.dist, distances)
+            return distances
+        # Gather consecutive edges of every tour at once, then add the closing edges
+        # explicitly instead of building a rolled copy of the whole matrix
+        distances = self.dist[tours[:, :-1], tours[:, 1:]].sum(axis=1, dtype=np.float64)
+        distances += self.dist[tours[:, -1], tours[:, 0]]
+        return distances
@@ -1,9 +1,11 @@
 """
 Replacement strategies for genetic algorithm.
 """
-from typing import List
+from concurrent.futures import Executor
+from typing import Callable, List, Optional
+import numpy as np
 from .individual import Individual
-from .population import Population
+from .population import Population, evaluate_individuals
 from .problem import TSPProblem
 from .config import GAConfig
 from .selection import select_survivors
@@ -12,7 +14,9 @@ from .mutation import create_offspring_mutation
 
 
 def create_new_generation(current_population: Population, problem: TSPProblem, 
-                         config: GAConfig) -> Population:
+                         config: GAConfig, executor: Optional[Executor] = None,
+                         evaluate: Optional[Callable[[List[Individual], TSPProblem], None]] = None
+                         ) -> Population:
     """
     Create new generation using elitism and (μ+λ) replacement strategy.
     
@@ -20,6 +24,9 @@ def create_new_generation(current_population: Population, problem: TSPProblem,
         current_population: Current population
         problem: TSP problem instance
         config: GA configuration
+        executor: Optional executor used to evaluate offspring in parallel
+        evaluate: Optional evaluation function for offspring (e.g. a memoizing
+                  DiversityManager.evaluate_cached); ignored when executor is given
         
     Returns:
         New population for next generation
@@ -57,16 +64,19 @@ def create_new_generation(current_population: Population, problem: TSPProblem,
         current_population.individuals,
         num_mutation,
         method=config.mutation,
-        mutation_rate=0.8  # High mutation rate for mutation offspring
+        mutation_rate=0.8,  # High mutation rate for mutation offspring
+        problem=problem
     )
     
     # Combine all individuals for new population
     all_individuals = survivors + crossover_offspring + mutation_offspring
     
     # Evaluate fitness for new individuals
-    for individual in all_individuals:
-        if individual.fitness is None:
-            individual.evaluate_fitness(problem)
+    unevaluated = [individual for individual in all_individuals if individual.fitness is None]
+    if evaluate is not None and executor is None:
+        evaluate(unevaluated, problem)
+    else:
+        evaluate_individuals(unevaluated, problem, executor, config.max_workers)
     
     # Create new population
     new_population = Population(all_individuals[:config.N])  # Ensure exact size
@@ -111,7 +121,8 @@ def steady_state_replacement(current_population: Population, problem: TSPProblem
             current_population.individuals[:config.N//2],  # Use better half as parents
             num_mutation,
             method=config.mutation,
-            mutation_rate=0.7
+            mutation_rate=0.7,
+            problem=problem
         )
         offspring.extend(mutation_offspring)
     
@@ -171,20 +182,26 @@ def tournament_replacement(current_population: Population, offspring: List[Indiv
     import random
     
     new_individuals = current_population.individuals.copy()
+    # Distances kept alongside (inf = unevaluated) and updated as children move in
+    distances = current_population.distances.copy()
+    
+    # Population size is fixed during replacement, compute sampling bounds once
+    num_individuals = len(new_individuals)
+    sample_size = min(tournament_size, num_individuals)
     
     for child in offspring:
         # Select random individuals for tournament
-        competitors_indices = random.sample(range(len(new_individuals)), 
-                                          min(tournament_size, len(new_individuals)))
+        competitors_indices = random.sample(range(num_individuals), sample_size)
         
-        # Find worst competitor
-        worst_idx = max(competitors_indices, 
-                       key=lambda i: new_individuals[i].distance if new_individuals[i].distance is not None else 0)
+        # Find worst competitor (unevaluated ones count as 0, as before)
+        competitor_distances = distances[competitors_indices]
+        competitor_distances[np.isinf(competitor_distances)] = 0
+        worst_idx = competitors_indices[int(competitor_distances.argmax())]
         
         # Replace if child is better
         if (child.distance is not None and 
-            (new_individuals[worst_idx].distance is None or 
-             child.distance < new_individuals[worst_idx].distance)):
+            (np.isinf(distances[worst_idx]) or child.distance < distances[worst_idx])):
             new_individuals[worst_idx] = child
+            distances[worst_idx] = child.distance
     
     return Population(new_individuals)
\ No newline at end of file
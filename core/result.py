@@ -2,6 +2,7 @@
 Result classes for genetic algorithm.
 """
 from typing import Any
+import numpy as np
 
 
 class GAResult:
@@ -13,10 +14,11 @@ class GAResult:
         self.best_distance: float | int = float('inf')
         self.history: list[dict[str, Any]] = []
     
-    def update_best(self, route: list[int], distance: float | int):
-        """Update best solution found."""
+    def update_best(self, route: list[int] | np.ndarray, distance: float | int):
+        """Update best solution found (the route is only copied on improvement)."""
         if distance < self.best_distance:
-            self.best_route = route.copy()
+            # Stored as a plain list of city indices, whatever the tour container
+            self.best_route = np.asarray(route).tolist()
             self.best_distance = distance
     
     def add_iteration(self, iter_num: int, best_distance: float | int, 
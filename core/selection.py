@@ -1,86 +1,133 @@
 """
 Selection operators for genetic algorithm.
 """
-import random
-from typing import List
+from typing import Iterable, List, Tuple
+import numpy as np
 from .individual import Individual
 from .population import Population
+from ._kernels import NUMBA_AVAILABLE, tournament_winners
 
 
-def select_tournament(population: Population, k: int = 3) -> Individual:
+def select_tournament(population: Population, k: int = 3, copy: bool = False) -> Individual:
     """
-    Tournament selection: select k random individuals and return the best one.
+    Tournament selection: select k random individuals (with replacement) and return the best one.
+    
+    Assumes every individual in the population has been evaluated.
     
     Args:
         population: Population to select from
         k: Tournament size (number of individuals to compete)
+        copy: Return a copy instead of the population's individual
         
     Returns:
-        Selected individual (copy)
+        Selected individual
     """
-    # Randomly select k individuals for tournament
-    tournament_candidates = random.sample(population.individuals, min(k, len(population.individuals)))
-    
-    # Return the best individual from tournament (shortest distance)
-    winner = min(tournament_candidates, key=lambda ind: ind.distance if ind.distance is not None else float('inf'))
-    
-    return winner.copy()
+    return select_parents(population, 1, method="tournament", tournament_size=k, copy=copy)[0]
 
 
-def select_rank_based(population: Population) -> Individual:
+def select_rank_based(population: Population, copy: bool = False) -> Individual:
     """
     Rank-based selection: individuals with better rank have higher probability.
     
+    Assumes every individual in the population has been evaluated.
+    
     Args:
         population: Population to select from
+        copy: Return a copy instead of the population's individual
         
     Returns:
-        Selected individual (copy)
+        Selected individual
     """
-    # Sort population by fitness (best first)
-    sorted_pop = sorted(population.individuals, key=lambda ind: ind.distance if ind.distance is not None else float('inf'))
-    
-    # Create rank weights (best individual gets highest weight)
-    n = len(sorted_pop)
-    weights = [n - i for i in range(n)]  # [n, n-1, n-2, ..., 1]
-    
-    # Select based on weights
-    selected = random.choices(sorted_pop, weights=weights, k=1)[0]
-    
-    return selected.copy()
+    return select_parents(population, 1, method="rank", copy=copy)[0]
 
 
 def select_parents(population: Population, num_parents: int, method: str = "tournament", 
-                  tournament_size: int = 3) -> List[Individual]:
+                  tournament_size: int = 3, copy: bool = False) -> List[Individual]:
     """
     Select multiple parents for reproduction.
     
+    Selected individuals are returned by reference: crossover and mutation
+    always build new tours, so copying here is only needed by callers that
+    modify the selected individuals in place.
+    
     Args:
         population: Population to select from
         num_parents: Number of parents to select
         method: Selection method ("tournament" or "rank")
         tournament_size: Size of tournament (if using tournament selection)
+        copy: Return copies instead of the population's individuals
         
     Returns:
         List of selected parents
     """
-    parents = []
+    return _take(population, _select_indices(population, num_parents, method, tournament_size),
+                 copy)
+
+
+def select_parents_view(population: Population, num_parents: int, method: str = "tournament",
+                        tournament_size: int = 3) -> List[Tuple[Individual, int]]:
+    """
+    Select multiple parents as (individual, index) pairs, never copying.
     
-    for _ in range(num_parents):
-        if method == "tournament":
-            parent = select_tournament(population, tournament_size)
-        elif method == "rank":
-            parent = select_rank_based(population)
-        else:
-            raise ValueError(f"Unknown selection method: {method}")
+    The individuals are the population's own objects; callers must treat them
+    as read-only (crossover and mutation only read their parents' tours).
+    
+    Args:
+        population: Population to select from
+        num_parents: Number of parents to select
+        method: Selection method ("tournament" or "rank")
+        tournament_size: Size of tournament (if using tournament selection)
         
-        parents.append(parent)
+    Returns:
+        List of (individual, index in population.individuals) tuples
+    """
+    individuals = population.individuals
+    indices = _select_indices(population, num_parents, method, tournament_size)
+    return [(individuals[i], i) for i in indices]
+
+
+def _select_indices(population: Population, num_parents: int, method: str,
+                    tournament_size: int) -> List[int]:
+    """Indices of the selected parents in population.individuals."""
+    if method == "tournament":
+        if NUMBA_AVAILABLE:
+            # Compiled sample + argmin per tournament; the seed comes from the
+            # global NumPy state so seeded runs stay reproducible
+            winners = np.empty(num_parents, dtype=np.int64)
+            seed = np.random.randint(0, np.iinfo(np.int64).max, dtype=np.int64)
+            tournament_winners(population.distances, tournament_size, seed, winners)
+        else:
+            # All tournaments at once: one row of k contestants (drawn with replacement)
+            # per parent, winner = shortest distance in the row
+            contestants = np.random.randint(0, len(population.individuals),
+                                            size=(num_parents, tournament_size))
+            best_in_row = population.distances[contestants].argmin(axis=1)
+            winners = contestants[np.arange(num_parents), best_in_row]
+        return winners.tolist()
     
-    return parents
+    if method == "rank":
+        # Rank once per call (best first), then draw every parent from the
+        # cumulative rank weights [n, n-1, ..., 1] by binary search
+        n = len(population.individuals)
+        order = np.argsort(population.distances, kind='stable')
+        cum_weights = np.cumsum(np.arange(n, 0, -1))
+        ranks = np.searchsorted(cum_weights, np.random.random(num_parents) * cum_weights[-1],
+                                side='right')
+        return order[ranks].tolist()
+    
+    raise ValueError(f"Unknown selection method: {method}")
+
+
+def _take(population: Population, indices: Iterable[int], copy: bool) -> List[Individual]:
+    """Individuals at the given indices, optionally copied."""
+    individuals = population.individuals
+    if copy:
+        return [individuals[i].copy() for i in indices]
+    return [individuals[i] for i in indices]
 
 
 def select_survivors(population: Population, num_survivors: int, method: str = "tournament",
-                    elitism: int = 0) -> List[Individual]:
+                    elitism: int = 0, copy: bool = False) -> List[Individual]:
     """
     Select survivors for next generation.
     
@@ -89,6 +136,7 @@ def select_survivors(population: Population, num_survivors: int, method: str = "
         num_survivors: Number of survivors to select
         method: Selection method ("tournament" or "rank")
         elitism: Number of best individuals to automatically preserve
+        copy: Return copies instead of the population's individuals
         
     Returns:
         List of survivors
@@ -97,14 +145,15 @@ def select_survivors(population: Population, num_survivors: int, method: str = "
     
     # Add elite individuals first
     if elitism > 0:
-        population.sort_by_fitness()
+        # Only the top few are needed, so partition instead of sorting everything
         elite_count = min(elitism, num_survivors, len(population.individuals))
-        survivors.extend([ind.copy() for ind in population.individuals[:elite_count]])
+        elites = population.get_best_k(elite_count)
+        survivors.extend([ind.copy() for ind in elites] if copy else elites)
     
     # Select remaining survivors
     remaining_slots = num_survivors - len(survivors)
     if remaining_slots > 0:
-        additional_survivors = select_parents(population, remaining_slots, method)
+        additional_survivors = select_parents(population, remaining_slots, method, copy=copy)
         survivors.extend(additional_survivors)
     
     return survivors[:num_survivors]  # Ensure we don't exceed the limit
\ No newline at end of file
@@ -1,16 +1,44 @@
 from __future__ import annotations
+from functools import lru_cache
 from typing import List, Tuple, Optional
+import io
+import mmap
 import os
+import re
 
-try:
+import numpy as np
+
+# Importado como subpaquete (p.ej. lab04.iotsp) -> import relativo;
+# como paquete de nivel superior (iotsp) -> core está en sys.path
+if __package__ and "." in __package__:
     from ..core.problem import TSPProblem
-except Exception:
+else:
     from core.problem import TSPProblem
 
 
 SUPPORTED_TYPES = {"TSP"}
 SUPPORTED_WEIGHT_TYPES = {"EUC_2D"}
 
+# Óptimos conocidos de TSPLIB (claves ya normalizadas, ver _normalize_name)
+_OPTIMA = {
+    "berlin52": 7542,
+    "eil51": 426,
+    "eil76": 538,
+    "st70": 675,
+    "pr76": 108159,
+    "att48": 10628,
+    "kroa100": 21282,
+    "lin105": 14379,
+    "ch130": 6110,
+    "ch150": 6528,
+    "kroa200": 29368,
+    "a280": 2579,
+}
+_NAME_STRIP = str.maketrans("", "", "_-")
+# Palabras clave solo al inicio de línea (un COMMENT puede mencionarlas)
+_COORD_SECTION_RE = re.compile(rb"^[ \t]*NODE_COORD_SECTION", re.MULTILINE | re.IGNORECASE)
+_EOF_RE = re.compile(rb"^[ \t]*EOF", re.MULTILINE | re.IGNORECASE)
+
 
 def parse_tsplib(filepath: str) -> dict:
     """Parsea un archivo .tsp (TSPLIB) básico con NODE_COORD_SECTION.
@@ -31,55 +59,40 @@ def parse_tsplib(filepath: str) -> dict:
     ew_type: Optional[str] = None
     coords: List[Tuple[float, float]] = []
 
-    in_coords = False
-
-    with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-        for raw in f:
-            line = raw.strip()
-            if not line:
-                continue
-            up = line.upper()
-
-            if up.startswith("NAME"):
-                # NAME: berlin52
-                parts = line.split(":", 1)
-                if len(parts) == 2:
-                    name = parts[1].strip()
-                else:
-                    name = line.split()[1]
-            elif up.startswith("TYPE"):
-                parts = line.split(":", 1)
-                if len(parts) == 2:
-                    tp = parts[1].strip().upper()
-            elif up.startswith("DIMENSION"):
-                parts = line.split(":", 1)
-                if len(parts) == 2:
-                    dim = int(parts[1].strip())
-            elif up.startswith("EDGE_WEIGHT_TYPE"):
-                parts = line.split(":", 1)
-                if len(parts) == 2:
-                    ew_type = parts[1].strip().upper()
-            elif up.startswith("NODE_COORD_SECTION"):
-                in_coords = True
-            elif up.startswith("EOF"):
-                break
-            elif in_coords:
-                # Formato típico:  idx  x  y
-                parts = line.split()
-                if len(parts) >= 3:
-                    # ignoramos el índice TSPLIB (1..n) y guardamos (x,y)
-                    try:
-                        # algunas instancias usan enteros, otras float
-                        # parts[0] = id, parts[1] = x, parts[2] = y
-                        x = float(parts[1])
-                        y = float(parts[2])
-                        coords.append((x, y))
-                    except ValueError:
-                        # línea no válida, la saltamos
-                        pass
-                # si ya reunimos 'dim' coords, podemos terminar
-                if dim is not None and len(coords) >= dim:
-                    in_coords = False
+    # Cabecera y bloque de coordenadas se separan sobre un mmap del archivo
+    header, coord_block = _split_sections(filepath)
+
+    for raw in header.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        up = line.upper()
+
+        if up.startswith("NAME"):
+            # NAME: berlin52
+            parts = line.split(":", 1)
+            if len(parts) == 2:
+                name = parts[1].strip()
+            else:
+                name = line.split()[1]
+        elif up.startswith("TYPE"):
+            parts = line.split(":", 1)
+            if len(parts) == 2:
+                tp = parts[1].strip().upper()
+        elif up.startswith("DIMENSION"):
+            parts = line.split(":", 1)
+            if len(parts) == 2:
+                dim = int(parts[1].strip())
+        elif up.startswith("EDGE_WEIGHT_TYPE"):
+            parts = line.split(":", 1)
+            if len(parts) == 2:
+                ew_type = parts[1].strip().upper()
+        elif up.startswith("EOF"):
+            break
+
+    if coord_block is not None:
+        arr = _parse_coord_block(coord_block, dim)
+        coords = list(map(tuple, arr.tolist()))
 
     # Validaciones básicas
     if tp is None or tp not in SUPPORTED_TYPES:
@@ -100,15 +113,59 @@ def parse_tsplib(filepath: str) -> dict:
     }
 
 
+def _split_sections(filepath: str) -> Tuple[str, Optional[bytes]]:
+    """Divide el archivo en (cabecera, bloque NODE_COORD_SECTION..EOF).
+
+    Se busca sobre un mmap de los bytes, sin decodificar ni recorrer el
+    archivo línea a línea; solo la cabecera (pocas líneas) se decodifica.
+    El bloque es None si no hay NODE_COORD_SECTION.
+    """
+    if os.path.getsize(filepath) == 0:
+        return "", None
+
+    with open(filepath, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        section = _COORD_SECTION_RE.search(mm)
+        if section is None:
+            return mm[:].decode("utf-8", errors="ignore"), None
+
+        header = mm[:section.start()].decode("utf-8", errors="ignore")
+        # el bloque empieza en la línea siguiente a la palabra clave
+        body = mm.find(b"\n", section.end())
+        if body < 0:
+            return header, b""
+        body += 1
+        end = _EOF_RE.search(mm, body)
+        block = mm[body:end.start()] if end is not None else mm[body:]
+
+    return header, block
+
+
+def _parse_coord_block(block: bytes, dim: Optional[int]) -> np.ndarray:
+    """Convierte las líneas 'idx x y' del bloque en un array (n, 2) de float64."""
+    try:
+        # ignoramos el índice TSPLIB (1..n)
+        return np.loadtxt(io.BytesIO(block), usecols=(1, 2), max_rows=dim,
+                          ndmin=2, dtype=np.float64)
+    except ValueError as e:
+        raise ValueError(f"NODE_COORD_SECTION inválida: {e}") from e
+
+
 def load_tsplib_problem(filepath: str) -> TSPProblem:
-    """Carga un .tsp EUC_2D y devuelve un TSPProblem (usa coords)."""
+    """Carga un .tsp EUC_2D y devuelve un TSPProblem.
+
+    La matriz de distancias (EUC_2D, redondeada) se calcula una sola vez aquí,
+    al construir el TSPProblem; evaluar un tour es solo un gather sobre ella.
+    """
     meta = parse_tsplib(filepath)
     return TSPProblem(coords=meta["coords"])
 
 
+@lru_cache(maxsize=256)
 def known_optimum(name: str) -> Optional[int]:
     """Devuelve el óptimo conocido (si lo tenemos hardcodeado)."""
-    key = (name or "").strip().lower()
-    if key in {"berlin52", "berlin_52", "berlin-52"}:
-        return 7542
-    return None
+    return _OPTIMA.get(_normalize_name(name))
+
+
+def _normalize_name(name: Optional[str]) -> str:
+    """Clave canónica de una instancia: minúsculas, sin espacios, '_' ni '-'."""
+    return (name or "").strip().lower().translate(_NAME_STRIP)
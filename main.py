@@ -249,7 +249,7 @@ def main():
     
     if show_viz:
         print("Preparando visualización...")
-        visualizer = TSPVisualizer(coords, figsize=(15, 8))
+        visualizer = TSPVisualizer(coords, figsize=(15, 8), max_generations=config.maxIter)
         callbacks = [visualizer.callback_function]
     
     print("\nEjecutando algoritmo genético...")
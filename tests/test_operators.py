@@ -9,41 +9,53 @@ import unittest
 import random
 import sys
 import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+import numpy as np
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from core.individual import Individual
 from core.problem import TSPProblem
-from core.crossover import crossover_ox, crossover_pmx
-from core.mutation import mutate_swap, mutate_inversion, mutate_scramble
-from core.selection import select_tournament
-from core.population import Population
+from core.crossover import crossover_ox, crossover_pmx, create_offspring_crossover
+from core.mutation import mutate_swap, mutate_inversion, mutate_scramble, create_offspring_mutation
+from core.selection import select_tournament, select_parents_view
+from core.population import Population, evaluate_individuals, MIN_PARALLEL_EVALUATION
+from core.config import GAConfig
+from core.ga_core import run_ga
+from core.diversity import DiversityManager
+from core._kernels import batch_ox, batch_pmx
 
 
 class TestOperators(unittest.TestCase):
     """Test cases for GA operators."""
     
-    def setUp(self):
-        """Set up test fixtures."""
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures shared by all tests (operators never modify their inputs)."""
+        # Operators draw from the global NumPy state; seed it once so runs are
+        # reproducible under any test runner, not only via __main__
+        np.random.seed(42)
+        
         # Create a simple TSP problem
         coords = [(0, 0), (1, 0), (1, 1), (0, 1), (0.5, 0.5)]
-        self.problem = TSPProblem(coords=coords)
+        cls.problem = TSPProblem(coords=coords)
         
         # Create test individuals
-        self.individual1 = Individual(tour=[0, 1, 2, 3, 4])
-        self.individual2 = Individual(tour=[4, 3, 2, 1, 0])
-        self.individual3 = Individual(tour=[2, 0, 4, 1, 3])
+        cls.individual1 = Individual(tour=[0, 1, 2, 3, 4])
+        cls.individual2 = Individual(tour=[4, 3, 2, 1, 0])
+        cls.individual3 = Individual(tour=[2, 0, 4, 1, 3])
         
         # Evaluate fitness
-        for ind in [self.individual1, self.individual2, self.individual3]:
-            ind.evaluate_fitness(self.problem)
+        for ind in [cls.individual1, cls.individual2, cls.individual3]:
+            ind.evaluate_fitness(cls.problem)
     
     def is_valid_permutation(self, tour, n):
         """Check if tour is a valid permutation of cities 0 to n-1."""
-        return (len(tour) == n and 
-                set(tour) == set(range(n)) and 
-                len(set(tour)) == n)
+        tour = np.asarray(tour)
+        return tour.shape == (n,) and np.array_equal(np.sort(tour), np.arange(n))
     
     def test_individual_validity(self):
         """Test that individuals are valid permutations."""
@@ -98,6 +110,66 @@ class TestOperators(unittest.TestCase):
             self.assertTrue(child1.is_valid_tour())
             self.assertTrue(child2.is_valid_tour())
     
+    def test_crossover_with_given_cuts(self):
+        """Test that pre-drawn cut points keep the parent segment in place."""
+        for crossover in [crossover_ox, crossover_pmx]:
+            child1, child2 = crossover(self.individual1, self.individual3, cuts=(1, 3))
+            
+            self.assertTrue(child1.is_valid_tour())
+            self.assertTrue(child2.is_valid_tour())
+        
+        child1, child2 = crossover_ox(self.individual1, self.individual3, cuts=(1, 3))
+        self.assertEqual(child1.tour[1:4].tolist(), self.individual1.tour[1:4].tolist())
+        self.assertEqual(child2.tour[1:4].tolist(), self.individual3.tour[1:4].tolist())
+    
+    def test_single_pair_matches_batch_crossover(self):
+        """Test that single-pair operators and the batched kernels build identical children."""
+        parents = np.stack([self.individual1.tour, self.individual3.tour])
+        pair_idx = np.array([[0, 1]], dtype=np.int64)
+        for (crossover, batch_kernel) in [(crossover_ox, batch_ox), (crossover_pmx, batch_pmx)]:
+            for cuts in [(0, 4), (1, 3), (2, 2)]:
+                children = np.empty((2, self.problem.n), dtype=np.int32)
+                batch_kernel(parents, pair_idx, np.array([cuts], dtype=np.int64), children)
+                child1, child2 = crossover(self.individual1, self.individual3, cuts=cuts)
+                
+                self.assertEqual(child1.tour.tolist(), children[0].tolist())
+                self.assertEqual(child2.tour.tolist(), children[1].tolist())
+    
+    def test_single_crossover_definitions(self):
+        """Test that ga_core re-exports the crossover operators instead of redefining them."""
+        from core import ga_core
+        
+        self.assertIs(ga_core.crossover_ox, crossover_ox)
+        self.assertIs(ga_core.crossover_pmx, crossover_pmx)
+        self.assertEqual(crossover_pmx.__module__, 'core.crossover')
+        
+        for _ in range(20):
+            child1, child2 = ga_core.crossover_pmx(self.individual1, self.individual3)
+            self.assertTrue(self.is_valid_permutation(child1.tour, self.problem.n))
+            self.assertTrue(self.is_valid_permutation(child2.tour, self.problem.n))
+    
+    def test_create_offspring_crossover_validity(self):
+        """Test that batched crossover produces the requested number of valid children."""
+        parents = [self.individual1, self.individual2, self.individual3]
+        
+        for method in ["OX", "PMX"]:
+            for num_offspring in [1, 2, 7]:
+                offspring = create_offspring_crossover(parents, num_offspring, method=method)
+                
+                self.assertEqual(len(offspring), num_offspring)
+                for child in offspring:
+                    self.assertTrue(child.is_valid_tour(), f"Child not valid: {child.tour}")
+    
+    def test_create_offspring_crossover_keeps_parents(self):
+        """Test that batched crossover leaves the parent tours untouched."""
+        parents = [self.individual1, self.individual2, self.individual3]
+        before = [parent.tour.copy() for parent in parents]
+        
+        for method in ["OX", "PMX"]:
+            create_offspring_crossover(parents, 6, method=method)
+            for parent, tour in zip(parents, before):
+                np.testing.assert_array_equal(parent.tour, tour)
+    
     def test_mutate_swap_validity(self):
         """Test that swap mutation produces valid permutations."""
         for _ in range(100):
@@ -121,6 +193,39 @@ class TestOperators(unittest.TestCase):
                                f"Mutated not valid: {mutated.tour}")
                 self.assertTrue(self.is_valid_permutation(mutated.tour, self.problem.n))
     
+    def test_mutate_inversion_delta_distance(self):
+        """Test that the 2-opt delta matches a full tour evaluation."""
+        for _ in range(100):
+            for individual in [self.individual1, self.individual2, self.individual3]:
+                mutated = mutate_inversion(individual, self.problem)
+                
+                self.assertIsNotNone(mutated.distance)
+                self.assertAlmostEqual(mutated.distance,
+                                       self.problem.calculate_tour_distance(mutated.tour))
+    
+    def test_create_offspring_mutation_inversion(self):
+        """Test batched inversion offspring are valid and correctly evaluated."""
+        parents = [self.individual1, self.individual2, self.individual3]
+        offspring = create_offspring_mutation(parents, 50, method="inversion",
+                                              mutation_rate=0.8, problem=self.problem)
+        
+        self.assertEqual(len(offspring), 50)
+        for child in offspring:
+            self.assertTrue(child.is_valid_tour())
+            self.assertAlmostEqual(child.distance,
+                                   self.problem.calculate_tour_distance(child.tour))
+    
+    def test_create_offspring_mutation_validity(self):
+        """Test batched swap/scramble offspring are valid permutations."""
+        parents = [self.individual1, self.individual2, self.individual3]
+        
+        for method in ["swap", "scramble"]:
+            offspring = create_offspring_mutation(parents, 50, method=method, mutation_rate=0.8)
+            
+            self.assertEqual(len(offspring), 50)
+            for child in offspring:
+                self.assertTrue(child.is_valid_tour(), f"Child not valid: {child.tour}")
+    
     def test_mutate_scramble_validity(self):
         """Test that scramble mutation produces valid permutations."""
         for _ in range(100):
@@ -141,12 +246,12 @@ class TestOperators(unittest.TestCase):
             mutated = mutation_func(self.individual1)
             
             # Should have same cities, just different order
-            self.assertEqual(set(original_tour), set(mutated.tour))
+            self.assertTrue(np.array_equal(np.sort(original_tour), np.sort(mutated.tour)))
     
     def test_tournament_selection(self):
         """Test tournament selection."""
-        # Create population
-        individuals = [self.individual1, self.individual2, self.individual3]
+        # Create population (from copies: Population rebinds tours to its own matrix)
+        individuals = [self.individual1.copy(), self.individual2.copy(), self.individual3.copy()]
         population = Population(individuals)
         
         # Test tournament selection multiple times
@@ -154,9 +259,50 @@ class TestOperators(unittest.TestCase):
             selected = select_tournament(population, k)
             
             # Selected individual should be a copy of one from population
-            self.assertIn(selected.tour, [ind.tour for ind in individuals])
+            self.assertIn(selected.tour.tolist(), [ind.tour.tolist() for ind in individuals])
             self.assertIsInstance(selected, Individual)
     
+    def test_select_parents_view_returns_references(self):
+        """Test that view selection returns the population's own individuals and their indices."""
+        population = Population([self.individual1.copy(), self.individual2.copy(), self.individual3.copy()])
+        
+        for method in ["tournament", "rank"]:
+            for ind, idx in select_parents_view(population, 10, method=method):
+                self.assertIs(ind, population.individuals[idx])
+    
+    def test_population_arrays_stay_aligned(self):
+        """Test that the tours matrix and distances follow the individuals when sorting."""
+        population = Population([self.individual1.copy(), self.individual2.copy(), self.individual3.copy()])
+        population.sort_by_fitness()
+        
+        for i, ind in enumerate(population.individuals):
+            self.assertEqual(population.tours[i].tolist(), ind.tour.tolist())
+            self.assertEqual(population.distances[i], ind.distance)
+        self.assertEqual(list(population.distances), sorted(population.distances))
+    
+    def test_unique_tours_first_occurrences(self):
+        """Test the distinct-tour count and first-occurrence indices."""
+        individuals = [self.individual1.copy(), self.individual2.copy(), self.individual1.copy(),
+                       self.individual3.copy(), self.individual2.copy()]
+        population = Population(individuals)
+        
+        count, first_idx = population.unique_tours()
+        self.assertEqual(count, 3)
+        self.assertEqual(first_idx.tolist(), [0, 1, 3])
+        self.assertAlmostEqual(population.calculate_diversity(), 3 / 5)
+        self.assertAlmostEqual(population.compute_stats()[2], 3 / 5)
+    
+    def test_get_best_k_matches_sorted_order(self):
+        """Test that partition-based elite selection matches a full sort."""
+        individuals = [self.individual1.copy(), self.individual2.copy(), self.individual3.copy()]
+        population = Population(individuals)
+        expected = sorted(individuals, key=lambda ind: ind.distance)
+        
+        for k in range(len(individuals) + 1):
+            best = population.get_best_k(k)
+            self.assertEqual([ind.distance for ind in best],
+                             [ind.distance for ind in expected[:k]])
+    
     def test_fitness_calculation(self):
         """Test fitness calculation."""
         for individual in [self.individual1, self.individual2, self.individual3]:
@@ -189,26 +335,30 @@ class TestOperators(unittest.TestCase):
     
     def test_crossover_preserves_elements(self):
         """Test that crossover preserves all cities."""
-        for _ in range(20):
-            child1, child2 = crossover_ox(self.individual1, self.individual2)
+        n = self.problem.n
+        for crossover in [crossover_ox, crossover_pmx]:
+            # Collect every child, then check all rows at once
+            children = np.empty((40, n), dtype=np.int32)
+            for i in range(20):
+                child1, child2 = crossover(self.individual1, self.individual2)
+                children[2 * i] = child1.tour
+                children[2 * i + 1] = child2.tour
             
             # Both children should have all cities
-            self.assertEqual(set(child1.tour), set(range(self.problem.n)))
-            self.assertEqual(set(child2.tour), set(range(self.problem.n)))
-            
-            child1, child2 = crossover_pmx(self.individual1, self.individual2)
-            
-            self.assertEqual(set(child1.tour), set(range(self.problem.n)))
-            self.assertEqual(set(child2.tour), set(range(self.problem.n)))
+            self.assertTrue((np.sort(children, axis=1) == np.arange(n)).all())
 
 
 class TestProblemClass(unittest.TestCase):
     """Test TSP problem class."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Unit square shared by the read-only problem tests."""
+        cls.square = TSPProblem(coords=[(0, 0), (1, 0), (1, 1), (0, 1)])
+    
     def test_distance_matrix_symmetry(self):
         """Test that distance matrix is symmetric."""
-        coords = [(0, 0), (1, 0), (1, 1), (0, 1)]
-        problem = TSPProblem(coords=coords)
+        problem = self.square
         
         n = problem.n
         for i in range(n):
@@ -218,16 +368,14 @@ class TestProblemClass(unittest.TestCase):
     
     def test_distance_matrix_diagonal(self):
         """Test that diagonal distances are zero."""
-        coords = [(0, 0), (1, 0), (1, 1), (0, 1)]
-        problem = TSPProblem(coords=coords)
+        problem = self.square
         
         for i in range(problem.n):
             self.assertEqual(problem.get_distance(i, i), 0)
     
     def test_tour_distance_calculation(self):
         """Test tour distance calculation."""
-        coords = [(0, 0), (1, 0), (1, 1), (0, 1)]
-        problem = TSPProblem(coords=coords)
+        problem = self.square
         
         # Simple square: should be 4.0 for tour [0,1,2,3]
         tour = [0, 1, 2, 3]
@@ -236,6 +384,140 @@ class TestProblemClass(unittest.TestCase):
         # Distance should be sum of edges: (0,0)->(1,0) + (1,0)->(1,1) + (1,1)->(0,1) + (0,1)->(0,0)
         # = 1 + 1 + 1 + 1 = 4
         self.assertEqual(distance, 4)
+    
+    def test_batch_tour_distances_match_single(self):
+        """Test that batch evaluation matches per-tour evaluation."""
+        random.seed(7)
+        coords = [(random.uniform(0, 100), random.uniform(0, 100)) for _ in range(12)]
+        problem = TSPProblem(coords=coords)
+        
+        population = Population([Individual(n=problem.n) for _ in range(10)])
+        population.evaluate_all(problem)
+        
+        for i, ind in enumerate(population.individuals):
+            expected = problem.calculate_tour_distance(ind.tour)
+            self.assertEqual(ind.distance, expected)
+            self.assertEqual(population.distances[i], expected)
+
+
+class TestParallelEvaluation(unittest.TestCase):
+    """Test fitness evaluation through a process pool."""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Random 12-city problem and a spawned two-worker pool shared by the tests."""
+        rng = random.Random(11)
+        cls.problem = TSPProblem(coords=[(rng.uniform(0, 100), rng.uniform(0, 100))
+                                         for _ in range(12)])
+        cls.executor = ProcessPoolExecutor(max_workers=2,
+                                           mp_context=multiprocessing.get_context("spawn"))
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.executor.shutdown()
+    
+    def test_evaluate_individuals_chunks_match_serial(self):
+        """Test that chunked parallel evaluation keeps results in individual order."""
+        individuals = [Individual(n=self.problem.n) for _ in range(MIN_PARALLEL_EVALUATION + 5)]
+        
+        # Force several chunks regardless of the machine's core count
+        with mock.patch('core.population.os.cpu_count', return_value=3):
+            evaluate_individuals(individuals, self.problem, self.executor)
+        
+        for ind in individuals:
+            self.assertEqual(ind.distance, self.problem.calculate_tour_distance(ind.tour))
+    
+    def test_evaluate_individuals_one_chunk_per_worker(self):
+        """Test that chunks follow the worker count, not the machine's core count."""
+        individuals = [Individual(n=self.problem.n) for _ in range(MIN_PARALLEL_EVALUATION)]
+        
+        with mock.patch('core.population.os.cpu_count', return_value=64), \
+                mock.patch.object(self.executor, 'map', wraps=self.executor.map) as mapped:
+            evaluate_individuals(individuals, self.problem, self.executor, num_workers=2)
+        
+        self.assertEqual(len(list(mapped.call_args.args[1])), 2)
+        for ind in individuals:
+            self.assertEqual(ind.distance, self.problem.calculate_tour_distance(ind.tour))
+    
+    def test_population_evaluate_all_with_executor(self):
+        """Test that Population.evaluate_all fills its distances through the pool."""
+        population = Population([Individual(n=self.problem.n)
+                                 for _ in range(MIN_PARALLEL_EVALUATION)])
+        population.evaluate_all(self.problem, executor=self.executor)
+        
+        expected = [self.problem.calculate_tour_distance(t) for t in population.tours]
+        self.assertEqual(population.distances.tolist(), expected)
+    
+    def test_run_ga_with_workers(self):
+        """Test a short run with max_workers set (pool created and shut down by run_ga)."""
+        config = GAConfig(N=40, maxIter=3, pct_survivors=0.2, pct_crossover=0.5,
+                          pct_mutation=0.3, seed=1, max_workers=2)
+        with mock.patch('builtins.print'):
+            result = run_ga(self.problem, config)
+        
+        self.assertEqual(sorted(result.best_route), list(range(self.problem.n)))
+        self.assertAlmostEqual(result.best_distance,
+                               self.problem.calculate_tour_distance(result.best_route))
+
+
+class TestDiversity(unittest.TestCase):
+    """Test diversity metrics."""
+    
+    def test_hamming_diversity_matches_pairwise(self):
+        """Test vectorized Hamming diversity against the pairwise definition."""
+        individuals = [Individual(n=8) for _ in range(10)]
+        individuals.append(individuals[0].copy())
+        
+        expected_total = 0.0
+        comparisons = 0
+        for i in range(len(individuals)):
+            for j in range(i + 1, len(individuals)):
+                differing = sum(1 for a, b in zip(individuals[i].tour, individuals[j].tour) if a != b)
+                expected_total += differing / 8
+                comparisons += 1
+        
+        diversity = DiversityManager()._calculate_hamming_diversity(individuals)
+        self.assertAlmostEqual(diversity, expected_total / comparisons)
+    
+    def test_has_converged_waits_for_restart(self):
+        """Test that a flat best distance only counts as converged after a partial restart."""
+        manager = DiversityManager(stagnation_threshold=20, convergence_window=60)
+        for _ in range(100):
+            manager.update_stagnation_counter(1000.0)
+        self.assertFalse(manager.has_converged())
+        
+        # Restart just happened: it gets stagnation_threshold generations first
+        manager.restart_count = 1
+        manager.generations_since_restart = 0
+        for _ in range(19):
+            manager.update_stagnation_counter(1000.0)
+        self.assertFalse(manager.has_converged())
+        manager.update_stagnation_counter(1000.0)
+        self.assertTrue(manager.has_converged())
+    
+    def test_has_converged_false_while_improving(self):
+        """Test that steady improvement over the window is not convergence."""
+        manager = DiversityManager(stagnation_threshold=20, convergence_window=60)
+        manager.restart_count = 1
+        for generation in range(100):
+            manager.update_stagnation_counter(1000.0 - generation)
+        self.assertFalse(manager.has_converged())
+    
+    def test_run_ga_stops_on_stagnation_without_restart(self):
+        """Test that a short run stops after maxIter // 4 flat generations."""
+        problem = TSPProblem(coords=[(0, 0), (1, 0), (1, 1), (0, 1)])
+        config = GAConfig(N=10, maxIter=40, pct_survivors=0.2, pct_crossover=0.5,
+                          pct_mutation=0.3, seed=1)
+        with mock.patch('builtins.print'):
+            result = run_ga(problem, config)
+        
+        self.assertEqual(result.best_distance, 4)
+        self.assertLess(len(result.history), config.maxIter)
+    
+    def test_hamming_diversity_identical_tours(self):
+        """Test that identical tours have zero Hamming diversity."""
+        individuals = [Individual(tour=[0, 1, 2, 3]) for _ in range(5)]
+        self.assertEqual(DiversityManager()._calculate_hamming_diversity(individuals), 0.0)
 
 
 if __name__ == '__main__':
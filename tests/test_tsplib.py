@@ -0,0 +1,95 @@
+"""
+Unit tests for the TSPLIB reader.
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from iotsp import parse_tsplib, known_optimum
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+SMALL_TSP = """NAME: small4
+COMMENT: {comment}
+TYPE: TSP
+DIMENSION: 4
+EDGE_WEIGHT_TYPE: EUC_2D
+NODE_COORD_SECTION
+1 0 0
+2 {x2} 0
+3 3 4
+4 0 4
+EOF
+"""
+
+
+class TestParseTsplib(unittest.TestCase):
+    """Test parse_tsplib on the bundled instance and small generated files."""
+    
+    def write_tsp(self, comment="Cuatro ciudades", x2="3"):
+        """Write a small .tsp file and return its path (removed after the test)."""
+        handle = tempfile.NamedTemporaryFile("w", suffix=".tsp", delete=False, encoding="utf-8")
+        with handle:
+            handle.write(SMALL_TSP.format(comment=comment, x2=x2))
+        self.addCleanup(os.remove, handle.name)
+        return handle.name
+    
+    def test_berlin52(self):
+        """Test header fields and coordinates of the bundled berlin52 file."""
+        meta = parse_tsplib(os.path.join(DATA_DIR, 'berlin52.tsp'))
+        
+        self.assertEqual(meta['name'], 'berlin52')
+        self.assertEqual(meta['type'], 'TSP')
+        self.assertEqual(meta['edge_weight_type'], 'EUC_2D')
+        self.assertEqual(meta['dimension'], 52)
+        self.assertEqual(len(meta['coords']), 52)
+        self.assertEqual(meta['coords'][0], (565.0, 575.0))
+        self.assertEqual(meta['coords'][-1], (1740.0, 245.0))
+    
+    def test_small_file(self):
+        """Test that a minimal file is read completely."""
+        meta = parse_tsplib(self.write_tsp())
+        
+        self.assertEqual(meta['name'], 'small4')
+        self.assertEqual(meta['coords'], [(0.0, 0.0), (3.0, 0.0), (3.0, 4.0), (0.0, 4.0)])
+    
+    def test_comment_mentioning_keywords(self):
+        """Test that section keywords inside a COMMENT line are not taken as sections."""
+        meta = parse_tsplib(self.write_tsp(comment="TSP con NODE_COORD_SECTION y EOF"))
+        
+        self.assertEqual(meta['dimension'], 4)
+        self.assertEqual(meta['coords'][2], (3.0, 4.0))
+    
+    def test_malformed_row(self):
+        """Test that a non-numeric coordinate is reported."""
+        with self.assertRaises(ValueError) as ctx:
+            parse_tsplib(self.write_tsp(x2="abc"))
+        self.assertIn("NODE_COORD_SECTION", str(ctx.exception))
+    
+    def test_missing_file(self):
+        """Test that a missing file raises FileNotFoundError."""
+        with self.assertRaises(FileNotFoundError):
+            parse_tsplib(os.path.join(DATA_DIR, 'no_existe.tsp'))
+
+
+class TestKnownOptimum(unittest.TestCase):
+    """Test known_optimum name lookups."""
+    
+    def test_known_instance(self):
+        """Test lookups with the different spellings of an instance name."""
+        for name in ['berlin52', 'Berlin52', ' BERLIN-52 ', 'berlin_52']:
+            self.assertEqual(known_optimum(name), 7542)
+    
+    def test_unknown_instance(self):
+        """Test that unknown names give None."""
+        self.assertIsNone(known_optimum('small4'))
+        self.assertIsNone(known_optimum(''))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
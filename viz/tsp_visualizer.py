@@ -6,35 +6,68 @@ the best route found by the genetic algorithm evolves.
 
 import matplotlib.animation as animation
 import numpy as np
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
 import time
 import matplotlib.pyplot as plt
+from matplotlib.patches import PathPatch
+from matplotlib.path import Path
 
 class TSPVisualizer:
     """TSP Visualizer for a genetic algorithm"""
     
-    def __init__(self, coords: List[Tuple[float, float]], figsize: Tuple[int, int] = (12, 8)):
+    # Above this many cities, index labels are skipped and markers drawn smaller
+    MAX_LABELED_CITIES = 100
+    
+    def __init__(self, coords: List[Tuple[float, float]], figsize: Tuple[int, int] = (12, 8),
+                 max_generations: Optional[int] = None, render_every: int = 5,
+                 interactive: Optional[bool] = None):
+        """
+        Args:
+            coords: List of (x, y) coordinates for each city
+            figsize: Figure size in inches
+            max_generations: Expected number of generations; fixes the x-range of
+                             the statistics plot so it never needs rescaling
+            render_every: Redraw every this many generations (every one of the
+                          first 10 is drawn); the others are only recorded
+            interactive: Draw live updates; by default only when the figure
+                         has a GUI canvas (not with Agg or other file backends)
+        """
+        self.max_generations = max_generations
+        self.render_every = max(1, render_every)
         self.coords = np.array(coords, dtype=float)
         self.n_cities = len(coords)
+        # Closed-tour coordinates (first city repeated at the end), refilled in place
+        self._route_buf = np.empty((self.n_cities + 1, 2))
 
         self.fig, (self.ax_map, self.ax_stats) = plt.subplots(1, 2, figsize=figsize)
         self.fig.suptitle('Algoritmo Genético para TSP - Evolución en Tiempo Real', fontsize=16)
 
-        dx = np.ptp(self.coords[:, 0]) if self.n_cities > 0 else 0.0
-        dy = np.ptp(self.coords[:, 1]) if self.n_cities > 0 else 0.0
-        pad = max(dx, dy) * 0.05
+        # Bounding box in two reductions; the axis limits below reuse it
+        lo = self.coords.min(axis=0)
+        hi = self.coords.max(axis=0)
+        pad = (hi - lo).max() * 0.05
         if pad == 0.0:
             pad = 1.0 
 
-        plt.ion()
+        if interactive is None:
+            # GUI canvases declare the event loop they need; file backends don't
+            interactive = type(self.fig.canvas).required_interactive_framework is not None
+        self.interactive = interactive
+        if self.interactive:
+            plt.ion()
 
-        self.route_history = []
-        self.distance_history = []
-        self.avg_distance_history = []
-        self.diversity_history = []
-        self.generation_history = []
+        # History stored in preallocated arrays (grown by doubling if a run goes past
+        # max_generations); the first self._k rows are valid
+        capacity = max_generations or 256
+        self._k = 0
+        self._routes = np.empty((capacity, self.n_cities), dtype=np.int32)
+        self._dist = np.empty(capacity)
+        self._avg = np.empty(capacity)
+        self._div = np.empty(capacity)
+        self._gen = np.empty(capacity, dtype=np.int32)
+        self._max_dist = -np.inf
 
-        self.route_line = None
+        self.route_patch = None
         self.city_points = None
         self.best_distance_line = None
         self.avg_distance_line = None
@@ -42,8 +75,21 @@ class TSPVisualizer:
 
         self._setup_plots()
 
-        self.ax_map.set_xlim(self.coords[:,0].min() - pad, self.coords[:,0].max() + pad)
-        self.ax_map.set_ylim(self.coords[:,1].min() - pad, self.coords[:,1].max() + pad)
+        self.ax_map.set_xlim(lo[0] - pad, hi[0] + pad)
+        self.ax_map.set_ylim(lo[1] - pad, hi[1] + pad)
+        
+        # Static content (axes, grid, cities, labels) is rendered once and cached;
+        # updates only redraw the moving artists on top of it
+        self._background = None
+        # Animation built by save_animation and the history length it covers
+        self._anim = None
+        self._anim_frames = 0
+        if self.interactive:
+            self.fig.canvas.mpl_connect('draw_event', self._on_draw)
+            # plt.ion() came after the figure was created, so its window may
+            # still be hidden; nothing else shows it before show_final_result
+            self.fig.show()
+            self.fig.canvas.draw()
         
     def _setup_plots(self):
         self.ax_map.set_title('Mejor Ruta Actual')
@@ -52,16 +98,24 @@ class TSPVisualizer:
         self.ax_map.grid(True, alpha=0.3)
         self.ax_map.set_aspect('equal')
         
+        labeled = self.n_cities <= self.MAX_LABELED_CITIES
         self.city_points = self.ax_map.scatter(
             self.coords[:, 0], self.coords[:, 1], 
-            c='red', s=100, zorder=5, alpha=0.8
+            c='red', s=100 if labeled else 30, zorder=5, alpha=0.8
         )
         
-        for i, (x, y) in enumerate(self.coords):
-            self.ax_map.annotate(str(i), (x, y), xytext=(5, 5), 
-                               textcoords='offset points', fontsize=8)
+        # One text artist per city: unreadable and slow to lay out for large instances
+        if labeled:
+            for i, (x, y) in enumerate(self.coords):
+                self.ax_map.annotate(str(i), (x, y), xytext=(5, 5), 
+                                   textcoords='offset points', fontsize=8)
         
-        self.route_line, = self.ax_map.plot([], [], 'b-', linewidth=2, alpha=0.7)
+        # The route is one path over the closed-tour buffer: updates just repoint
+        # its vertices instead of repacking x/y data (NaN vertices draw nothing)
+        self._route_path = Path(np.full((self.n_cities + 1, 2), np.nan))
+        self.route_patch = PathPatch(self._route_path, fill=False, edgecolor='b',
+                                     linewidth=2, alpha=0.7)
+        self.ax_map.add_patch(self.route_patch)
         
         self.ax_stats.set_title('Evolución del Algoritmo')
         self.ax_stats.set_xlabel('Generación')
@@ -74,47 +128,155 @@ class TSPVisualizer:
         
         self.ax_stats.legend()
         
+        # Fixed margins instead of measuring every text artist with tight_layout
+        self.fig.subplots_adjust(left=0.07, right=0.98, top=0.88, bottom=0.08, wspace=0.25)
+        if self.max_generations:
+            self.ax_stats.set_xlim(0, self.max_generations)
+        
+        self._set_animated(True)
+        
+    def _dynamic_artists(self) -> list:
+        """Artists that change on every update."""
+        return [self.route_patch, self.ax_map.title,
+                self.best_distance_line, self.avg_distance_line, self.diversity_line]
+    
+    def _set_animated(self, animated: bool):
+        """Exclude (True) or include (False) the dynamic artists in full redraws."""
+        for artist in self._dynamic_artists():
+            artist.set_animated(animated)
+    
+    def _on_draw(self, event):
+        """Re-capture the background after every full redraw (first draw, resize, rescale)."""
+        canvas = self.fig.canvas
+        if not canvas.supports_blit or not self.route_patch.get_animated():
+            return
+        self._background = canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_dynamic_artists()
+    
+    def _draw_dynamic_artists(self):
+        for artist in self._dynamic_artists():
+            artist.axes.draw_artist(artist)
+    
+    def _show_route(self, route):
+        """Point the route patch at the coordinates of route."""
+        self._route_path.vertices = self._closed_route_coords(route)
+        self.route_patch.stale = True
+    
+    def _closed_route_coords(self, route) -> np.ndarray:
+        """Coordinates of route with the first city repeated at the end (shared buffer)."""
+        route = np.asarray(route, dtype=np.intp)
+        np.take(self.coords, route, axis=0, out=self._route_buf[:-1])
+        self._route_buf[-1] = self._route_buf[0]
+        return self._route_buf
+    
+    def _rescale_stats(self):
+        """Fit the statistics axis to its data (x-range kept at max_generations)."""
+        self.ax_stats.relim()
+        self.ax_stats.autoscale_view()
+        if self.max_generations:
+            self.ax_stats.set_xlim(0, max(self.max_generations, self._gen[self._k - 1]))
+    
+    def _stats_out_of_view(self) -> bool:
+        """Whether the statistics lines extend beyond the current axis limits."""
+        x0, x1 = self.ax_stats.get_xlim()
+        y0, y1 = self.ax_stats.get_ylim()
+        for line in (self.best_distance_line, self.avg_distance_line, self.diversity_line):
+            x, y = line.get_data()
+            if len(x) == 0:
+                continue
+            if x.min() < x0 or x.max() > x1 or y.min() < y0 or y.max() > y1:
+                return True
+        return False
+    
+    @property
+    def route_history(self) -> np.ndarray:
+        """Best route of every recorded generation, one per row."""
+        return self._routes[:self._k]
+    
+    @property
+    def distance_history(self) -> np.ndarray:
+        return self._dist[:self._k]
+    
+    @property
+    def avg_distance_history(self) -> np.ndarray:
+        return self._avg[:self._k]
+    
+    @property
+    def diversity_history(self) -> np.ndarray:
+        return self._div[:self._k]
+    
+    @property
+    def generation_history(self) -> np.ndarray:
+        return self._gen[:self._k]
+    
+    def _grow_history(self):
+        """Double the capacity of the history arrays."""
+        capacity = 2 * len(self._dist)
+        for name in ('_routes', '_dist', '_avg', '_div', '_gen'):
+            old = getattr(self, name)
+            new = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self._k] = old[:self._k]
+            setattr(self, name, new)
+    
     def callback_function(self, state: Dict[str, Any]):
         """
         Callback function called at each GA iteration.
         
+        Recording the state is a few array stores; the figure is only redrawn
+        on render generations.
+        
         Args:
             state: Dictionary with the current algorithm state
         """
-        self.route_history.append(state['best_route'].copy())
-        self.distance_history.append(state['best_distance'])
-        self.avg_distance_history.append(state['avg_distance'])
-        self.diversity_history.append(state['diversity']['unique_ratio'])
-        self.generation_history.append(state['iter'])
+        if self._k == len(self._dist):
+            self._grow_history()
+        k = self._k
+        self._routes[k] = state['best_route']
+        self._dist[k] = state['best_distance']
+        self._avg[k] = state['avg_distance']
+        self._div[k] = state['diversity']['unique_ratio']
+        self._gen[k] = state['iter']
+        self._max_dist = max(self._max_dist, state['best_distance'])
+        self._k = k + 1
         
-        if state['iter'] % 5 == 0 or state['iter'] < 10:
+        # Headless runs only record; the figure is filled in when shown or saved
+        if self.interactive and (state['iter'] % self.render_every == 0 or state['iter'] < 10):
             self._update_visualization()
     
     def _update_visualization(self):
         """Updates visualization with the most recent data."""
 
-        if not self.route_history:
+        if self._k == 0:
             return
             
-        current_route = self.route_history[-1]
-        route_coords = self.coords[current_route + [current_route[0]]]  
-        
-        self.route_line.set_data(route_coords[:, 0], route_coords[:, 1])
+        self._show_route(self.route_history[-1])
         
         current_distance = self.distance_history[-1]
         self.ax_map.set_title(f'Mejor Ruta - Distancia: {current_distance:.2f}')
         
-        if len(self.generation_history) > 1:
-            self.best_distance_line.set_data(self.generation_history, self.distance_history)
-            self.avg_distance_line.set_data(self.generation_history, self.avg_distance_history)
-            
-            scaled_diversity = np.array(self.diversity_history) * max(self.distance_history)
-            self.diversity_line.set_data(self.generation_history, scaled_diversity)
+        if self._k > 1:
+            generations = self.generation_history
+            self.best_distance_line.set_data(generations, self.distance_history)
+            self.avg_distance_line.set_data(generations, self.avg_distance_history)
             
-            self.ax_stats.relim()
-            self.ax_stats.autoscale_view()
+            scaled_diversity = self.diversity_history * self._max_dist
+            self.diversity_line.set_data(generations, scaled_diversity)
         
-        plt.pause(0.01)  
+        if not self.interactive:
+            self._rescale_stats()
+            return
+        
+        canvas = self.fig.canvas
+        if self._background is None or self._stats_out_of_view():
+            # Limits changed (or no blitting): rescale and do one full redraw,
+            # which also refreshes the cached background
+            self._rescale_stats()
+            canvas.draw()
+        else:
+            canvas.restore_region(self._background)
+            self._draw_dynamic_artists()
+            canvas.blit(self.fig.bbox)
+        canvas.flush_events()
         
     def create_animation_from_history(self, interval: int = 200) -> animation.FuncAnimation:
         """
@@ -126,13 +288,16 @@ class TSPVisualizer:
         Returns:
             FuncAnimation object
         """
+        # Frames are rendered with full draws, so the lines must be part of them
+        self._set_animated(False)
+        # Diversity scale of every frame (max best distance so far), computed once
+        running_max = np.maximum.accumulate(self.distance_history)
+        
         def animate(frame):
             if frame >= len(self.route_history):
                 return
                 
-            route = self.route_history[frame]
-            route_coords = self.coords[route + [route[0]]]
-            self.route_line.set_data(route_coords[:, 0], route_coords[:, 1])
+            self._show_route(self.route_history[frame])
             
             distance = self.distance_history[frame]
             generation = self.generation_history[frame]
@@ -148,7 +313,7 @@ class TSPVisualizer:
                     self.avg_distance_history[:frame+1]
                 )
                 
-                scaled_diversity = np.array(self.diversity_history[:frame+1]) * max(self.distance_history[:frame+1])
+                scaled_diversity = self._div[:frame+1] * running_max[frame]
                 self.diversity_line.set_data(
                     self.generation_history[:frame+1], 
                     scaled_diversity
@@ -169,12 +334,17 @@ class TSPVisualizer:
             filename: Name of the file
             fps: Frames per second
         """
-        anim = self.create_animation_from_history(interval=1000//fps)
-        anim.save(filename, writer='pillow', fps=fps)
+        # Reuse the animation across exports while the history hasn't grown;
+        # the writer's fps sets the GIF timing, not the animation's interval
+        if self._anim is None or self._anim_frames != self._k:
+            self._anim = self.create_animation_from_history(interval=1000//fps)
+            self._anim_frames = self._k
+        self._anim.save(filename, writer='pillow', fps=fps)
         print(f"Animación guardada como {filename}")
     
     def show_final_result(self):
-        if self.route_history:
+        self._set_animated(False)
+        if self._k:
             self._update_visualization()
             
             final_distance = self.distance_history[-1]
@@ -185,7 +355,6 @@ class TSPVisualizer:
                 fontsize=16
             )
             
-        plt.tight_layout()
         plt.show()
 
 def create_random_tsp_instance(n_cities: int = 20, seed: int = 42) -> List[Tuple[float, float]]:
@@ -200,9 +369,6 @@ def create_random_tsp_instance(n_cities: int = 20, seed: int = 42) -> List[Tuple
         List of city coordinates
     """
     np.random.seed(seed)
-    coords = []
-    for _ in range(n_cities):
-        x = np.random.uniform(0, 100)
-        y = np.random.uniform(0, 100)
-        coords.append((x, y))
-    return coords
\ No newline at end of file
+    # One draw for all cities; row order matches drawing x then y per city
+    coords = np.random.uniform(0, 100, size=(n_cities, 2))
+    return list(map(tuple, coords.tolist()))
\ No newline at end of file